@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 
 import item as item_
 
@@ -16,14 +16,38 @@ class NoAction(Exception):
     pass
 
 
+class Blocked:
+    """The result of planning an action which can not be performed."""
+
+    __slots__ = ("reason",)
+
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.reason!r})"
+
+
 class Action:
+    __slots__ = ("actor",)
+
     def __init__(self, actor: Actor):
         self.actor = actor
 
-    def poll(self) -> Action:
-        """Return the action to perform."""
+    def plan(self) -> Plan:
+        """Return the action to perform, or Blocked if there is none."""
         return self
 
+    def poll(self) -> Action:
+        """Return the action to perform, or raise NoAction if there is none.
+
+        This wraps `plan` for code which expects exceptions.
+        """
+        result = self.plan()
+        if isinstance(result, Blocked):
+            raise NoAction(result.reason)
+        return result
+
     def act(self) -> None:
         """Execute the action for this class."""
         raise NotImplementedError(self)
@@ -48,7 +72,7 @@ def kill_actor(self, target: Actor) -> None:
         for item in list(target.fighter.inventory.contents):
             item.lift()
             item.place(target.location)
-        target.location.map.actors.remove(target)  # Actually remove the actor.
+        target.despawn()  # Actually remove the actor.
         target.ticket = None  # Disable AI.
 
     @property
@@ -67,13 +91,20 @@ def report(self, msg: str) -> None:
         return self.model.report(msg)
 
 
+Plan = Union[Action, Blocked]
+
+
 class ActionWithPosition(Action):
+    __slots__ = ("target_pos",)
+
     def __init__(self, actor: Actor, position: Tuple[int, int]):
         super().__init__(actor)
         self.target_pos = position
 
 
 class ActionWithDirection(ActionWithPosition):
+    __slots__ = ("direction",)
+
     def __init__(self, actor: Actor, direction: Tuple[int, int]):
         position = actor.location.x + direction[0], actor.location.y + direction[1]
         super().__init__(actor, position)
@@ -81,12 +112,21 @@ def __init__(self, actor: Actor, direction: Tuple[int, int]):
 
 
 class ActionWithEntity(Action):
+    __slots__ = ("target_handle",)
+
     def __init__(self, actor: Actor, target: Actor):
         super().__init__(actor)
-        self.target = target
+        self.target_handle = target.handle
+
+    @property
+    def target(self) -> Optional[Actor]:
+        """The target actor, or None if it was removed."""
+        return self.map.actor_store.get(self.target_handle)
 
 
 class ActionWithItem(Action):
+    __slots__ = ("item",)
+
     def __init__(self, actor: Actor, target: Item):
         super().__init__(actor)
         self.item = target
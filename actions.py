@@ -5,24 +5,27 @@
     ActionWithDirection,
     ActionWithItem,
     ActionWithPosition,
-    NoAction,
+    Blocked,
+    Plan,
 )
 
 
 class MoveTo(ActionWithPosition):
     """Move an entity to a position, interacting with obstacles."""
 
-    def poll(self) -> Action:
+    __slots__ = ()
+
+    def plan(self) -> Plan:
         if self.actor.location.distance_to(*self.target_pos) > 1:
-            raise NoAction(
+            return Blocked(
                 "Can't move from %s to %s." % (self.actor.location.xy, self.target_pos)
             )
         if self.actor.location.xy == self.target_pos:
             return self
         if self.map.fighter_at(*self.target_pos):
-            return Attack(self.actor, self.target_pos).poll()
+            return Attack(self.actor, self.target_pos).plan()
         if self.map.is_blocked(*self.target_pos):
-            raise NoAction("That way is blocked.")
+            return Blocked("That way is blocked.")
         return self
 
     def act(self) -> None:
@@ -41,28 +44,34 @@ def act(self) -> None:
 class Move(ActionWithDirection):
     """Move an entity in a direction, interaction with obstacles."""
 
-    def poll(self) -> Action:
-        return MoveTo(self.actor, self.target_pos).poll()
+    __slots__ = ()
+
+    def plan(self) -> Plan:
+        return MoveTo(self.actor, self.target_pos).plan()
 
 
 class MoveTowards(ActionWithPosition):
     """Move towards and possibly interact with destination."""
 
-    def poll(self) -> Action:
+    __slots__ = ()
+
+    def plan(self) -> Plan:
         dx = self.target_pos[0] - self.location.x
         dy = self.target_pos[1] - self.location.y
         distance = max(abs(dx), abs(dy))
         dx = int(round(dx / distance))
         dy = int(round(dy / distance))
-        return Move(self.actor, (dx, dy)).poll()
+        return Move(self.actor, (dx, dy)).plan()
 
 
 class Attack(ActionWithPosition):
     """Make this entities Fighter attack another entity."""
 
-    def poll(self) -> Attack:
+    __slots__ = ()
+
+    def plan(self) -> Plan:
         if self.location.distance_to(*self.target_pos) > 1:
-            raise NoAction("That space is too far away to attack.")
+            return Blocked("That space is too far away to attack.")
         return self
 
     def act(self) -> None:
@@ -89,16 +98,20 @@ def act(self) -> None:
 class AttackPlayer(Action):
     """Move towards and attack the player."""
 
-    def poll(self) -> Action:
-        return MoveTowards(self.actor, self.map.player.location.xy).poll()
+    __slots__ = ()
+
+    def plan(self) -> Plan:
+        return MoveTowards(self.actor, self.map.player.location.xy).plan()
 
 
 class Pickup(Action):
-    def poll(self) -> Action:
+    __slots__ = ()
+
+    def plan(self) -> Plan:
         if not self.map.items.get(self.location.xy):
-            raise NoAction("There is nothing to pick up.")
+            return Blocked("There is nothing to pick up.")
         if self.actor.fighter.inventory.is_full():
-            raise NoAction("Your inventory is full.")
+            return Blocked("Your inventory is full.")
         return self
 
     def act(self) -> None:
@@ -109,6 +122,8 @@ def act(self) -> None:
 
 
 class ActivateItem(ActionWithItem):
+    __slots__ = ()
+
     def act(self) -> None:
         assert self.item in self.actor.inventory.contents
         self.item.activate(self)
@@ -116,6 +131,8 @@ def act(self) -> None:
 
 
 class DropItem(ActionWithItem):
+    __slots__ = ()
+
     def act(self) -> None:
         assert self.item in self.actor.inventory.contents
         self.item.lift()
@@ -2,43 +2,110 @@
 
 import math
 import sys
-import traceback
 from typing import TYPE_CHECKING, Optional, Tuple, Type
 
 import numpy as np  # type: ignore
 import tcod.map
 from tcod import libtcodpy
 
-from action import NoAction
+from action import Blocked
+from components import ActorTurn
+from telemetry import profiler
 
 if TYPE_CHECKING:
+    from action import Plan
     from ai import AI
     from fighter import Fighter
+    from gamemap import GameMap
     from inventory import Inventory
     from location import Location
     from tqueue import Ticket, TurnQueue
 
 
 class Actor:
+    """An entity on a map.
+
+    The actor is registered in the maps ActorStore under `handle`, which
+    also stores its position and look direction.
+    """
+
+    __slots__ = ("map", "fighter", "handle", "last_xy", "ticket", "ai", "_fov")
+
+    FOV_RADIUS = 9.5  # The sight radius of every actor.
+
     def __init__(self, location: Location, fighter: Fighter, ai_cls: Type[AI]):
-        self.location = location
+        self.map: GameMap = location.map
         self.fighter = fighter
-        location.map.actors.append(self)
-        self.ticket: Optional[Ticket] = location.map.scheduler.schedule(0, self.act)
+        self.handle = self.map.actor_store.add(self, location.xy, fighter)
+        self.last_xy = location.xy  # Position at the time of removal.
+        fighter.attach(self)
+        self.ticket: Optional[Ticket] = self.map.scheduler.schedule(
+            0, ActorTurn(self.map.actor_store, self.handle)
+        )
         self.ai = ai_cls(self)
         self._fov: Optional[np.ndarray] = None
-        self.look_dir: Tuple[int, int] = (1, 0)
+
+    @property
+    def slot(self) -> int:
+        """This actors current slot in the ActorStore, or -1 once removed."""
+        return self.map.actor_store.slot_of(self.handle)
+
+    def _live_slot(self) -> int:
+        """Return this actors slot, asserting that it hasn't been removed.
+
+        A stale handle has no slot, indexing the store with -1 would
+        silently use whichever actor is last.
+        """
+        slot = self.slot
+        assert slot >= 0, f"{self} has been despawned."
+        return slot
+
+    @property
+    def location(self) -> Location:
+        slot = self.slot
+        if slot < 0:
+            return self.map[self.last_xy]
+        store = self.map.actor_store
+        return self.map[int(store.x[slot]), int(store.y[slot])]
+
+    @location.setter
+    def location(self, location: Location) -> None:
+        assert location.map is self.map, "Actors can not change maps."
+        store = self.map.actor_store
+        slot = self._live_slot()
+        store.x[slot], store.y[slot] = location.xy
+
+    @property
+    def look_dir(self) -> Tuple[int, int]:
+        store = self.map.actor_store
+        slot = self._live_slot()
+        return int(store.look_x[slot]), int(store.look_y[slot])
+
+    @look_dir.setter
+    def look_dir(self, look_dir: Tuple[int, int]) -> None:
+        store = self.map.actor_store
+        slot = self._live_slot()
+        store.look_x[slot], store.look_y[slot] = look_dir
+
+    def despawn(self) -> None:
+        """Remove this actor from its map, this invalidates its handle."""
+        self.last_xy = self.location.xy
+        self.fighter.detach()
+        self.map.actor_store.remove(self.handle)
 
     def act(self, scheduler: TurnQueue, ticket: Ticket) -> None:
         if ticket is not self.ticket:
             return scheduler.unschedule(ticket)
-        try:
-            action = self.ai.poll()
-        except NoAction:
-            print(f"Unresolved action with {self}!", file=sys.stderr)
-            traceback.print_exc(file=sys.stderr)
+        if self.map.is_dormant(self):
+            return self.ai.act_dormant(self.map.dormant_interval(self))
+        self.perform(self.ai.plan())
+
+    def perform(self, action: Plan) -> None:
+        """Perform the planned action of this actors turn."""
+        if isinstance(action, Blocked):
+            print(f"Unresolved action with {self}: {action!r}", file=sys.stderr)
             return self.ai.reschedule(100)
-        assert action is action.poll(), f"{action} was not fully resolved, {self}."
+        assert action is action.plan(), f"{action} was not fully resolved, {self}."
         action.act()
 
     @property
@@ -48,8 +115,9 @@ def inventory(self) -> Inventory:
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}({self.location!r}, {self.fighter!r})"
 
+    @profiler.timed("actor_fov")
     def _compute_fov(self) -> None:
-        radius = 9.5
+        radius = self.FOV_RADIUS
         cone_width = math.tau * 1 / 8
         cone_dir = math.atan2(*self.look_dir)
         x, y = self.location.xy
@@ -1,29 +1,33 @@
 from __future__ import annotations
 
 import random
+from concurrent.futures import Future
 from typing import TYPE_CHECKING, List, Optional, Tuple
 
-import numpy as np
-import tcod.path
-
 import actions
+import pathing
 import states
-from action import Action, NoAction
+from action import Action, Blocked, NoAction, Plan
 
 if TYPE_CHECKING:
     from actor import Actor
 
 
 class FollowPath(Action):
+    __slots__ = ("subaction", "path")
+
     def __init__(self, actor: Actor, path: List[Tuple[int, int]]) -> None:
         super().__init__(actor)
         self.subaction: Optional[Action] = None
         self.path = path
 
-    def poll(self) -> Action:
+    def plan(self) -> Plan:
         if not self.path:
-            raise NoAction("End of path reached.")
-        self.subaction = actions.MoveTo(self.actor, self.path[0]).poll()
+            return Blocked("End of path reached.")
+        subaction = actions.MoveTo(self.actor, self.path[0]).plan()
+        if isinstance(subaction, Blocked):
+            return subaction
+        self.subaction = subaction
         return self
 
     def act(self) -> None:
@@ -32,61 +36,165 @@ def act(self) -> None:
         return self.subaction.act()
 
 
+class Travel(Action):
+    """Moves the player one step per turn, along a path or in a direction.
+
+    Planning is Blocked once the route ends or is interrupted: when another
+    actor can see the player, when an item is underfoot, or when a new
+    message is logged.
+    """
+
+    __slots__ = ("path", "direction", "subaction", "log_version", "steps")
+
+    def __init__(
+        self,
+        actor: Actor,
+        path: Optional[List[Tuple[int, int]]] = None,
+        direction: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        super().__init__(actor)
+        self.path = path or []
+        self.direction = direction
+        self.subaction: Optional[Action] = None
+        self.log_version = self.map.model.log_version
+        self.steps = 0
+
+    def interruption(self) -> Optional[str]:
+        """Return why traveling should stop now, or None."""
+        map_ = self.map
+        if map_.model.log_version != self.log_version:
+            return "Something happened."
+        x, y = self.actor.location.xy
+        if self.steps and (x, y) in map_.items:
+            return "There is something here."
+        store = map_.actor_store
+        for slot in store.slots_within(x, y, int(self.actor.FOV_RADIUS) + 1):
+            other = store.objects[slot]
+            if other is not self.actor and other.fov[x, y]:
+                return "You've been seen."
+        return None
+
+    def plan(self) -> Plan:
+        reason = self.interruption()
+        if reason:
+            return Blocked(reason)
+        if self.direction is not None:
+            result = actions.Move(self.actor, self.direction).plan()
+        elif self.path:
+            result = actions.MoveTo(self.actor, self.path[0]).plan()
+        else:
+            return Blocked("You have arrived.")
+        if not isinstance(result, actions.MoveTo):
+            return Blocked("Something is in the way.")
+        self.subaction = result
+        return self
+
+    def act(self) -> None:
+        assert self.subaction
+        if self.direction is None:
+            self.path.pop(0)
+        self.steps += 1
+        self.subaction.act()
+
+
 class Pathfinder(FollowPath):
+    """Follows a path to `dest_xy` from the maps PathService.
+
+    While the search is running the previous path is followed, if there is
+    none then the actor idles for one turn before waiting on the search.
+    """
+
+    __slots__ = ("request", "idled")
+
     def __init__(self, actor: Actor, dest_xy: Tuple[int, int]) -> None:
-        map_ = actor.location.map
-        walkable = np.copy(map_.tiles["move_cost"])
-        blocker_pos = [e.location.xy for e in map_.actors]
-        blocker_index = tuple(np.transpose(blocker_pos))
-        walkable[blocker_index] = False
-        walkable[dest_xy] = True
-        super().__init__(
-            actor, tcod.path.AStar(walkable).get_path(*actor.location.xy, *dest_xy)
-        )
-
-    def poll(self) -> Action:
+        super().__init__(actor, [])
+        self.request: Optional[Future[pathing.Path]] = None
+        self.idled = False
+        self.retarget(dest_xy)
+
+    def retarget(self, dest_xy: Tuple[int, int]) -> None:
+        """Request a new path to `dest_xy` unless one is already on its way."""
+        self.collect()
+        if self.request is None:
+            self.request = self.map.path_service.request(
+                self.actor.location.xy, dest_xy
+            )
+
+    def collect(self, wait: bool = False) -> None:
+        """Replace the current path with the finished search, if any."""
+        if self.request is None or not (wait or self.request.done()):
+            return
+        path = pathing.adopt_path(self.request.result(), self.actor.location.xy)
+        self.path = path if path is not None else []
+        self.request = None
+        self.idled = False
+
+    def plan(self) -> Plan:
+        if self.request is not None and not self.path:
+            if not self.idled and not self.request.done():
+                self.idled = True
+                return actions.Move(self.actor, (0, 0)).plan()
+            self.collect(wait=True)
+        self.collect()
         if not self.path:
-            raise NoAction("End of path reached.")
-        return actions.MoveTo(self.actor, self.path.pop(0)).poll()
+            return Blocked("End of path reached.")
+        return actions.MoveTo(self.actor, self.path.pop(0)).plan()
 
 
 class AI(Action):
+    __slots__ = ()
+
+    def act_dormant(self, interval: int) -> None:
+        """Take a coarse turn while far away from the player.
+
+        The default is to do nothing until `interval` ticks have passed.
+        """
+        self.reschedule(interval)
+
     def get_path(
         self, owner: Actor, target_xy: Tuple[int, int]
     ) -> List[Tuple[int, int]]:
-        map_ = owner.location.map
-        walkable = np.copy(map_.tiles["move_cost"])
-        blocker_pos = [e.location.xy for e in map_.actors]
-        blocker_index = tuple(np.transpose(blocker_pos))
-        walkable[blocker_index] = False
-        walkable[target_xy] = True
-        return tcod.path.AStar(walkable).get_path(*owner.location.xy, *target_xy)
+        return owner.location.map.path_service.find(owner.location.xy, target_xy)
+
+    def request_path(
+        self, owner: Actor, target_xy: Tuple[int, int]
+    ) -> Future[pathing.Path]:
+        return owner.location.map.path_service.request(owner.location.xy, target_xy)
 
 
 class BasicMonster(AI):
+    __slots__ = ("path", "request")
+
     def __init__(self, actor: Actor) -> None:
         super().__init__(actor)
         self.path: List[Tuple[int, int]] = []
+        self.request: Optional[Future[pathing.Path]] = None
 
-    def poll(self) -> Action:
+    def plan(self) -> Plan:
         owner = self.actor
         map_ = owner.location.map
+        if self.request is not None and self.request.done():
+            path = pathing.adopt_path(self.request.result(), owner.location.xy)
+            self.path = path if path is not None else []
+            self.request = None
         if map_.visible[owner.location.xy]:
-            self.path = self.get_path(owner, map_.player.location.xy)
+            if self.request is None:
+                self.request = self.request_path(owner, map_.player.location.xy)
             if len(self.path) >= 25:
                 self.path = []
-                try:
-                    return actions.MoveTowards(owner, map_.player.location.xy).poll()
-                except NoAction:
-                    pass
+                result = actions.MoveTowards(owner, map_.player.location.xy).plan()
+                if not isinstance(result, Blocked):
+                    return result
         if not self.path:
-            return actions.Move(owner, (0, 0)).poll()
+            return actions.Move(owner, (0, 0)).plan()
         if owner.location.distance_to(*map_.player.location.xy) <= 1:
-            return actions.AttackPlayer(owner).poll()
-        return actions.MoveTo(owner, self.path.pop(0)).poll()
+            return actions.AttackPlayer(owner).plan()
+        return actions.MoveTo(owner, self.path.pop(0)).plan()
 
 
 class TurnRandomly(Action):
+    __slots__ = ()
+
     DIRS = (
         (-1, -1),
         (-1, 0),
@@ -108,59 +216,124 @@ def act(self) -> None:
 
 
 class Wander(Action):
-    def poll(self) -> Action:
-        try:
-            if random.random() > 0.25:
-                return actions.Move(self.actor, self.actor.look_dir).poll()
-        except NoAction:
-            pass
-        return TurnRandomly(self.actor).poll()
+    __slots__ = ()
+
+    def plan(self) -> Plan:
+        if random.random() > 0.25:
+            result = actions.Move(self.actor, self.actor.look_dir).plan()
+            if not isinstance(result, Blocked):
+                return result
+        return TurnRandomly(self.actor).plan()
 
 
 class RandomPatrol(Action):
+    __slots__ = ("subaction",)
+
     def __init__(self, actor: Actor) -> None:
         super().__init__(actor)
         self.subaction: Optional[Pathfinder] = None
 
-    def poll(self) -> Action:
+    def plan(self) -> Plan:
         if self.subaction:
-            try:
-                return self.subaction.poll()
-            except NoAction:
-                pass
+            result = self.subaction.plan()
+            if not isinstance(result, Blocked):
+                return result
+        map_ = self.actor.location.map
         while True:
             dest_xy = (
-                random.randint(0, self.actor.location.map.width - 1),
-                random.randint(0, self.actor.location.map.height - 1),
+                random.randint(0, map_.width - 1),
+                random.randint(0, map_.height - 1),
             )
+            if not map_.tiles["move_cost"][dest_xy]:
+                continue  # Only search for paths which can exist.
             self.subaction = Pathfinder(self.actor, dest_xy)
-            try:
-                return self.subaction.poll()
-            except NoAction:
-                pass
+            result = self.subaction.plan()
+            if not isinstance(result, Blocked):
+                return result
+
+    def skip(self, steps: int) -> None:
+        """Jump up to `steps` cells along the current patrol path at once.
+
+        The actor stops before the first blocked cell.  No new path is made
+        if there isn't one, the next full turn will do that.
+        """
+        if not self.subaction:
+            return
+        self.subaction.collect()
+        path = self.subaction.path
+        map_ = self.actor.location.map
+        x, y = self.actor.location.xy
+        look_dir = self.actor.look_dir
+        taken = 0
+        for next_x, next_y in path[:steps]:
+            if map_.is_blocked(next_x, next_y):
+                break
+            look_dir = next_x - x, next_y - y
+            x, y = next_x, next_y
+            taken += 1
+        if not taken:
+            return
+        del path[:taken]
+        self.actor.location = map_[x, y]
+        self.actor.look_dir = look_dir
+        self.actor._fov = None
 
 
 class GuardAI(AI):
+    __slots__ = ("pathfinder", "random_patrol")
+
     def __init__(self, actor: Actor) -> None:
         super().__init__(actor)
-        self.pathfinder: Optional[Action] = None
+        self.pathfinder: Optional[Pathfinder] = None
         self.random_patrol = RandomPatrol(self.actor)
 
-    def poll(self) -> Action:
+    def plan(self) -> Plan:
         player = self.actor.location.map.player
         if self.actor.fov[player.location.xy]:
-            self.pathfinder = Pathfinder(self.actor, player.location.xy)
+            if self.pathfinder:
+                self.pathfinder.retarget(player.location.xy)
+            else:
+                self.pathfinder = Pathfinder(self.actor, player.location.xy)
         if self.pathfinder:
-            try:
-                return self.pathfinder.poll()
-            except NoAction:
-                self.pathfinder = None
-        return self.random_patrol.poll()
+            result = self.pathfinder.plan()
+            if not isinstance(result, Blocked):
+                return result
+            self.pathfinder = None
+        return self.random_patrol.plan()
+
+    def act_dormant(self, interval: int) -> None:
+        """Forget any chase and skip ahead along the patrol route."""
+        self.pathfinder = None
+        self.random_patrol.skip(interval // self.actor.fighter.speed)
+        self.reschedule(interval)
 
 
 class PlayerControl(AI):
+    __slots__ = ("travel", "travel_view")
+
+    def __init__(self, actor: Actor) -> None:
+        super().__init__(actor)
+        self.travel: Optional[Travel] = None
+        self.travel_view: Optional[states.Traveling] = None
+
+    def start_travel(self, travel: Travel) -> None:
+        """Continue `travel` on the following turns until it stops."""
+        self.travel = travel
+        self.travel_view = states.Traveling(self.actor.location.map.model)
+
+    def continue_travel(self) -> None:
+        """Take the next step of the current travel, or stop traveling."""
+        assert self.travel and self.travel_view
+        if self.travel_view.update():
+            result = self.travel.plan()
+            if not isinstance(result, Blocked):
+                return result.act()
+        self.travel = self.travel_view = None
+
     def act(self) -> None:
         ticket = self.actor.ticket
+        if self.travel:
+            self.continue_travel()
         while ticket is self.actor.ticket:
             try:
                 states.PlayerReady(self.actor.location.map.model).loop()
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+)
+
+import tcod.event
+
+from components import ActorTurn
+
+if TYPE_CHECKING:
+    from gamemap import GameMap
+    from pregen import FloorPool
+
+POLL_INTERVAL = 0.01  # Longest time between polls of the event queue.
+
+# Background tasks run on this loop, but only while waiting for input.
+_loop = asyncio.new_event_loop()
+_tasks: Dict[Hashable, asyncio.Task[None]] = {}
+
+
+def start(key: Hashable, factory: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """Start `factory()` as a background task unless `key` is still running.
+
+    Tasks should only update caches, and should await often so that input is
+    handled promptly.  Tasks never run during a turn, so turns play out the
+    same as if there were no tasks.
+    """
+    task = _tasks.get(key)
+    if task is None or task.done():
+        _tasks[key] = _loop.create_task(factory())
+
+
+def _prune() -> None:
+    """Forget finished tasks, raising the exceptions of any which failed."""
+    for key, task in list(_tasks.items()):
+        if task.done():
+            del _tasks[key]
+            if not task.cancelled():
+                task.result()
+
+
+def wait(timeout: Optional[float] = None) -> List[Any]:
+    """Return new events like tcod.event.wait, but run tasks until they arrive.
+
+    The event queue is polled every POLL_INTERVAL while background tasks
+    run or wait on other processes.  Once there is nothing left to do this
+    blocks for the rest of `timeout`.
+    """
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    while True:
+        events = list(tcod.event.get())
+        if events:
+            return events
+        _prune()
+        if deadline is None:
+            remaining = None
+        else:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return []
+        if not _tasks:
+            return list(tcod.event.wait(remaining))
+        if remaining is None or remaining > POLL_INTERVAL:
+            remaining = POLL_INTERVAL
+        _loop.call_later(remaining, _loop.stop)
+        _loop.run_forever()
+
+
+def shutdown() -> None:
+    """Cancel all background tasks and let them finish."""
+    for task in _tasks.values():
+        task.cancel()
+    if _tasks:
+        _loop.run_until_complete(asyncio.wait(list(_tasks.values())))
+    _tasks.clear()
+
+
+async def precompute_fovs(gamemap: GameMap) -> None:
+    """Compute missing actor FOVs, in the order the actors will act.
+
+    Dormant actors are skipped.  If the map has a memory budget then only
+    the actors near the view are done, since the rest would be evicted.
+    """
+    store = gamemap.actor_store
+    allowed: Set[int] = set()
+    if gamemap.memory_budget is not None:
+        allowed = set(gamemap.slots_near_view().tolist())
+    for ticket in sorted(gamemap.scheduler.heap):
+        turn = ticket.func
+        if not isinstance(turn, ActorTurn) or turn.store is not store:
+            continue
+        actor = store.get(turn.handle)
+        if (
+            actor is None
+            or actor is gamemap.player
+            or actor._fov is not None
+            or gamemap.is_dormant(actor)
+            or (gamemap.memory_budget is not None and actor.slot not in allowed)
+        ):
+            continue
+        actor.fov
+        await asyncio.sleep(0)
+
+
+async def pregenerate_floors(pool: FloorPool) -> None:
+    """Keep the next floors generating and build each one once it arrives.
+
+    The layouts come from the pool's worker process, only placing their
+    tiles and spawning their entities is done here.
+    """
+    pool.fill()
+    while pool.pending:
+        await asyncio.wrap_future(pool.pending[0])
+        pool.build_ready()
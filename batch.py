@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+import actions
+import ai
+import pathing
+from action import Blocked
+from components import ActorTurn
+
+if TYPE_CHECKING:
+    from action import Plan
+    from actor import Actor
+    from gamemap import GameMap
+    from tqueue import Ticket
+
+
+class _Moves:
+    """Plain moves of a batch which have been planned but not yet applied.
+
+    Each move is applied to `gamemap.occupancy` right away, so later actors
+    plan against it, and to the actor store and the turn queue on `flush`.
+    """
+
+    def __init__(self, gamemap: GameMap) -> None:
+        self.map = gamemap
+        self.actors: List[Actor] = []
+        self.plans: List[Plan] = []
+        self.slots: List[int] = []
+        self.dst: List[Tuple[int, int]] = []
+
+    def add(self, actor: Actor, plan: Plan, move: actions.MoveTo) -> None:
+        slot = actor.slot
+        occupancy = self.map.occupancy
+        assert occupancy is not None
+        occupancy[actor.location.xy] = -1
+        occupancy[move.target_pos] = slot
+        self.actors.append(actor)
+        self.plans.append(plan)
+        self.slots.append(slot)
+        self.dst.append(move.target_pos)
+
+    def flush(self) -> None:
+        """Apply the pending moves in one pass, then reschedule each actor."""
+        if not self.actors:
+            return
+        store = self.map.actor_store
+        slots = np.array(self.slots, dtype=np.intp)
+        dst_x, dst_y = np.array(self.dst, dtype=np.int32).T
+        dx = dst_x - store.x[slots]
+        dy = dst_y - store.y[slots]
+        moved = (dx != 0) | (dy != 0)
+        store.x[slots] = dst_x
+        store.y[slots] = dst_y
+        store.look_x[slots[moved]] = dx[moved]
+        store.look_y[slots[moved]] = dy[moved]
+        speeds = store.speed[slots].tolist()
+        scheduler = self.map.scheduler
+        for actor, plan, was_moved, speed in zip(
+            self.actors, self.plans, moved.tolist(), speeds
+        ):
+            if was_moved:
+                actor._fov = None
+            if isinstance(plan, ai.FollowPath):
+                plan.path.pop(0)
+            assert actor.ticket
+            actor.ticket = scheduler.reschedule(actor.ticket, speed)
+        self.actors.clear()
+        self.plans.clear()
+        self.slots.clear()
+        self.dst.clear()
+
+
+def invoke_batch(gamemap: GameMap) -> None:
+    """Run all non-player actor turns due at the next tick as one batch.
+
+    Every actor plans in unique_id order, as TurnQueue.invoke_next would
+    run them.  Plain moves are held back: each one updates an occupancy
+    grid which later actors plan against, and the held moves are written
+    to the actor store together.  Any other action first applies the held
+    moves and then runs as usual.  The result is always the same as
+    running the turns one at a time.
+
+    The FOVs which the batch will need are computed together first, on the
+    path search threads since tcod releases the GIL.
+
+    If the next ticket is not a non-player actor turn this falls back to
+    TurnQueue.invoke_next.
+    """
+    scheduler = gamemap.scheduler
+    store = gamemap.actor_store
+
+    def accept(ticket: Ticket) -> bool:
+        turn = ticket.func
+        if not isinstance(turn, ActorTurn) or turn.store is not store:
+            return False
+        actor = store.get(turn.handle)
+        return (
+            actor is not None
+            and actor is not gamemap.player
+            and ticket is actor.ticket
+            and not gamemap.is_dormant(actor)
+        )
+
+    tickets = scheduler.pop_due(accept)
+    if not tickets:
+        return scheduler.invoke_next()
+
+    actors = [store.get(ticket.func.handle) for ticket in tickets]  # type: ignore
+    _compute_fovs([actor for actor in actors if actor and actor._fov is None])
+    moves = _Moves(gamemap)
+    gamemap.occupancy = store.slot_grid(gamemap.shape)
+    try:
+        for i, (ticket, actor) in enumerate(zip(tickets, actors)):
+            if gamemap.model.is_player_dead():
+                # The game is over, leave the remaining turns as they were.
+                scheduler.reattach(tickets[i:])
+                break
+            if actor is None or ticket is not actor.ticket:
+                scheduler.unschedule(ticket)  # Killed earlier in this batch.
+                continue
+            plan = actor.ai.plan()
+            move = _get_move(plan)
+            if move is not None:
+                moves.add(actor, plan, move)
+                continue
+            moves.flush()
+            count = store.count
+            actor.perform(plan)
+            if store.count != count:  # Slots were moved by a removal.
+                gamemap.occupancy = store.slot_grid(gamemap.shape)
+        moves.flush()
+    finally:
+        gamemap.occupancy = None
+
+
+def _get_move(plan: Plan) -> Optional[actions.MoveTo]:
+    """Return the MoveTo performed by `plan`, if it is only a move."""
+    if isinstance(plan, Blocked):
+        return None
+    if isinstance(plan, actions.MoveTo):
+        return plan
+    if isinstance(plan, ai.FollowPath) and isinstance(plan.subaction, actions.MoveTo):
+        return plan.subaction
+    return None
+
+
+def _compute_fovs(actors: List[Actor]) -> None:
+    """Compute the FOVs of `actors` in parallel."""
+    if len(actors) < 2:
+        return
+    list(pathing.get_executor().map(lambda actor: actor.fov, actors))
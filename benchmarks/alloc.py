@@ -0,0 +1,95 @@
+"""Measure memory allocations of the turn loop.
+
+Run from the repository root with: python -m benchmarks.alloc
+To compare against an older tree, copy this benchmarks package into a
+checkout of it and run the same command there.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from typing import Any, Dict, List
+
+import item
+from action import Action
+from model import Message, Model
+
+from .common import make_model, run_turns, spawn_guards
+
+
+def instance_size(obj: Any) -> int:
+    """Return the size of an object plus its instance dict, if it has one."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def population_bytes(model: Model) -> int:
+    """Return the instance bytes of every actor, fighter, item and location."""
+    map_ = model.active_map
+    objects: List[Any] = []
+    for actor in map_.actors:
+        objects += [actor, actor.fighter, actor.location]
+    for items in map_.items.values():
+        objects += items
+    # Interned locations, on trees which have them.
+    objects += getattr(map_, "_locations", {}).values()
+    return sum(instance_size(obj) for obj in {id(obj): obj for obj in objects}.values())
+
+
+def measure(
+    width: int, height: int, guards: int, turns: int, seed: int
+) -> Dict[str, Any]:
+    model = make_model(width, height, seed)
+    spawn_guards(model, guards, seed)
+    run_turns(model, turns)  # Warm up caches and interned locations.
+    gc.collect()
+    gc.disable()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        transient = 0
+        for _ in range(turns):
+            # Restarting tracemalloc makes the peak relative to this turn.
+            tracemalloc.start()
+            run_turns(model, 1)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            transient += peak
+        net_blocks = sys.getallocatedblocks() - blocks_before
+    finally:
+        gc.enable()
+    player = model.active_map.player
+    return {
+        "turns": turns,
+        "actors": len(model.active_map.actors),
+        "transient_bytes_per_turn": transient / turns,
+        "net_blocks_per_turn": net_blocks / turns,
+        "population_bytes": population_bytes(model),
+        "instance_bytes": {
+            "MapLocation": instance_size(player.location),
+            "Action": instance_size(Action(player)),
+            "Message": instance_size(Message("")),
+            "Pistol": instance_size(item.Pistol()),
+            "Actor": instance_size(player),
+            "Fighter": instance_size(player.fighter),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--guards", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    results = measure(args.size, args.size, args.guards, args.turns, args.seed)
+    for key, value in results.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+import ai
+import fighter
+import procgen
+from model import Model
+
+if TYPE_CHECKING:
+    from action import Plan
+
+
+class AutoPlayer(ai.AI):
+    """A player AI which wanders instead of waiting for input."""
+
+    __slots__ = ()
+
+    def plan(self) -> Plan:
+        return ai.Wander(self.actor).plan()
+
+    def poll(self) -> Any:
+        """The AI interface before plan(), for comparing against older trees."""
+        return getattr(ai.Wander(self.actor), "poll")()
+
+
+def make_model(width: int, height: int, seed: int = 0) -> Model:
+    """Return a Model with a generated map which can run without a display.
+
+    The player is controlled by AutoPlayer and can not die.  Paths are
+    searched synchronously so that runs are reproducible.
+    """
+    random.seed(seed)
+    model = Model()
+    model.active_map = procgen.build(
+        procgen.generate_layout(width, height, seed), player_ai=AutoPlayer
+    )
+    model.active_map.model = model
+    if hasattr(model.active_map, "path_service"):  # Older trees search inline.
+        model.active_map.path_service.threaded = False
+    player = model.active_map.player
+    player.fighter.max_hp = player.fighter.hp = 10 ** 9
+    return model
+
+
+def spawn_guards(model: Model, count: int, seed: int = 0) -> None:
+    """Spawn up to `count` extra guards on free cells of the active map."""
+    map_ = model.active_map
+    index = np.s_[0 : map_.width, 0 : map_.height]
+    for x, y in map_.sample_free(np.random.default_rng(seed), index, count):
+        fighter.Guard.spawn(map_[x, y])
+
+
+def run_turns(model: Model, turns: int) -> None:
+    """Invoke `turns` scheduled actor turns."""
+    scheduler = model.active_map.scheduler
+    for _ in range(turns):
+        scheduler.invoke_next()
@@ -0,0 +1,166 @@
+"""Time the engine's hot paths at several map sizes and actor counts.
+
+Run from the repository root with: python -m benchmarks.hotpaths
+Results are written as JSON to stdout, or to --output.  Passing a previous
+results file as --baseline reports every case which got slower by more than
+--threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import tcod.console
+
+import ai
+import procgen
+import rendering
+from model import Model
+from tqueue import Ticket, TurnQueue
+
+from .common import make_model, spawn_guards
+
+SCREEN_WIDTH, SCREEN_HEIGHT = 80, 50
+QUEUE_SIZE = 10000  # Tickets per TurnQueue case.
+
+
+def time_calls(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Call `func` `repeat` times and return its timings in milliseconds."""
+    samples = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples[i] = time.perf_counter() - start
+    samples *= 1000
+    return {
+        "repeat": repeat,
+        "min": float(samples.min()),
+        "mean": float(samples.mean()),
+        "p50": float(np.percentile(samples, 50)),
+        "p95": float(np.percentile(samples, 95)),
+    }
+
+
+def queue_churn() -> None:
+    """Schedule QUEUE_SIZE tickets and pop all of them."""
+    queue = TurnQueue()
+    rng = np.random.default_rng(0)
+
+    def pop(queue: TurnQueue, ticket: Ticket) -> None:
+        queue.unschedule(ticket)
+
+    # invoke_next checks the heap after each call, so it must never be empty.
+    queue.schedule(2 ** 62, pop)
+    for interval in rng.integers(100, 1000, QUEUE_SIZE).tolist():
+        queue.schedule(interval, pop)
+    while len(queue.heap) > 1:
+        queue.invoke_next()
+
+
+def model_cases(model: Model) -> Dict[str, Callable[[], Any]]:
+    """Return the cases which run against an existing model."""
+    map_ = model.active_map
+    player = map_.player
+    guard = next(actor for actor in map_.actors if actor is not player)
+    view = tcod.console.Console(
+        SCREEN_WIDTH - rendering.UI_WIDTH, SCREEN_HEIGHT, order="F"
+    )
+    screen = tcod.console.Console(SCREEN_WIDTH, SCREEN_HEIGHT, order="F")
+
+    def actor_fov() -> None:
+        guard._fov = None
+        guard.fov
+
+    def pathfinder() -> None:
+        ai.Pathfinder(guard, player.location.xy).collect(wait=True)
+
+    def render() -> None:
+        view.clear()
+        map_.render(view)
+
+    return {
+        "update_fov": map_.update_fov,
+        "actor_fov": actor_fov,
+        "pathfinder": pathfinder,
+        "render": render,
+        "draw_main_view": lambda: rendering.draw_main_view(model, screen),
+    }
+
+
+def run(
+    sizes: List[int], actor_counts: List[int], repeat: int, seed: int
+) -> Dict[str, Dict[str, float]]:
+    """Run every case and return the timings keyed by case name."""
+    results = {"queue/schedule_pop": time_calls(queue_churn, repeat)}
+    for size in sizes:
+        results[f"{size}/generate"] = time_calls(
+            lambda: procgen.generate(size, size, seed), max(1, repeat // 10)
+        )
+        for count in actor_counts:
+            model = make_model(size, size, seed)
+            spawn_guards(model, count, seed)
+            actors = len(model.active_map.actors)
+            for name, func in model_cases(model).items():
+                stats = results[f"{size}/{count}/{name}"] = time_calls(func, repeat)
+                print(
+                    f"{size}x{size}, {actors} actors, {name}: {stats['p50']:.3f}ms",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Return a line for every case whose median is slower than the baseline."""
+    regressions = []
+    for name, stats in sorted(results.items()):
+        if name not in baseline:
+            continue
+        ratio = stats["p50"] / max(baseline[name]["p50"], 1e-9)
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {baseline[name]['p50']:.3f}ms -> {stats['p50']:.3f}ms"
+                f" ({ratio - 1:+.0%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 250, 1000])
+    parser.add_argument(
+        "--actors", type=int, nargs="+", default=[0, 200], help="Extra guards."
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results here, not stdout.")
+    parser.add_argument("--baseline")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.actors, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+            file.write("\n")
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Run the headless turn loop with growing populations to find scaling limits.
+
+Run from the repository root with: python -m benchmarks.stress
+Each population runs in a fresh process so that its peak RSS is its own.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import fighter
+import item
+from action import Action
+from model import Model
+from telemetry import profiler
+
+from .common import make_model, spawn_guards
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None  # type: ignore
+
+STACK_SIZE = 3  # Items in each item stack.
+
+
+def build_scenario(
+    size: int,
+    guards: int,
+    stacks: int,
+    corpses: int,
+    seed: int,
+    ai_lod_radius: Optional[int] = None,
+) -> Model:
+    """Return a model with extra guards, item stacks and corpses."""
+    model = make_model(size, size, seed)
+    map_ = model.active_map
+    map_.ai_lod_radius = ai_lod_radius
+    spawn_guards(model, guards, seed)
+    rng = np.random.default_rng(seed)
+    index = np.s_[0:size, 0:size]
+    for x, y in map_.sample_free(rng, index, stacks, allow_items=False):
+        for _ in range(STACK_SIZE):
+            item.Pistol().place(map_[x, y])
+    for x, y in map_.sample_free(rng, index, corpses, allow_items=False):
+        victim = fighter.Guard.spawn(map_[x, y])
+        Action(victim).kill_actor(victim)
+    return model
+
+
+def peak_rss() -> Optional[int]:
+    """Return the peak resident set size of this process in bytes, if known."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024  # Linux uses KiB.
+
+
+def measure(
+    size: int,
+    guards: int,
+    stacks: int,
+    corpses: int,
+    ticks: int,
+    seed: int,
+    ai_lod_radius: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run a scenario for `ticks` game ticks and return its statistics."""
+    model = build_scenario(size, guards, stacks, corpses, seed, ai_lod_radius)
+    scheduler = model.active_map.scheduler
+    profiler.enabled = True  # Used to count FOV and path calls.
+    start_tick = scheduler.current_tick
+    turns = 0
+    start = time.perf_counter()
+    while scheduler.current_tick - start_tick < ticks:
+        scheduler.invoke_next()
+        turns += 1
+    elapsed = time.perf_counter() - start
+    elapsed_ticks = scheduler.current_tick - start_tick
+    counts = {name: int(stats["count"]) for name, stats in profiler.summary().items()}
+    return {
+        "guards": guards,
+        "actors": len(model.active_map.actors),
+        "ai_lod_radius": ai_lod_radius,
+        "turns": turns,
+        "ticks_per_sec": elapsed_ticks / elapsed,
+        "ms_per_turn": elapsed * 1000 / turns,
+        "peak_rss": peak_rss(),
+        "fov_calls_per_tick": counts.get("actor_fov", 0) / elapsed_ticks,
+        "path_calls_per_tick": counts.get("find_path", 0) / elapsed_ticks,
+    }
+
+
+def add_scaling(results: List[Dict[str, Any]]) -> None:
+    """Add the exponent of ms_per_turn against guards between each run.
+
+    1.0 is linear scaling, anything much higher is a superlinear blowup.
+    """
+    for previous, current in zip(results, results[1:]):
+        if previous["guards"] <= 0:
+            continue
+        current["scaling"] = math.log(
+            current["ms_per_turn"] / previous["ms_per_turn"]
+        ) / math.log(current["guards"] / previous["guards"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=250)
+    parser.add_argument(
+        "--guards", type=int, nargs="+", default=[25, 50, 100, 200, 400, 800]
+    )
+    parser.add_argument("--stacks", type=int, default=100)
+    parser.add_argument("--corpses", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--ai-lod-radius",
+        type=int,
+        help="make actors further than this dormant, off by default like the game",
+    )
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = []
+    for guards in args.guards:
+        with ProcessPoolExecutor(1) as executor:
+            results.append(
+                executor.submit(
+                    measure,
+                    args.size,
+                    guards,
+                    args.stacks,
+                    args.corpses,
+                    args.ticks,
+                    args.seed,
+                    args.ai_lod_radius,
+                ).result()
+            )
+    add_scaling(results)
+    for result in results:
+        rss = (result["peak_rss"] or 0) / 2 ** 20
+        scaling = f" scaling {result['scaling']:.2f}" if "scaling" in result else ""
+        print(
+            f"{result['guards']:5} guards {result['ticks_per_sec']:9.1f} ticks/s"
+            f" {result['ms_per_turn']:7.3f} ms/turn"
+            f" {result['fov_calls_per_tick']:6.3f} fov/tick"
+            f" {result['path_calls_per_tick']:6.3f} path/tick"
+            f" {rss:7.1f} MiB{scaling}"
+        )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
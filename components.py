@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from actor import Actor
+    from fighter import Fighter
+    from tqueue import Ticket, TurnQueue
+
+INDEX_BITS = 32
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+class ActorStore:
+    """A registry of every actor on a map, with struct-of-arrays storage.
+
+    Live actors are packed densely into slots [0, count) of every column and
+    of `objects`.  Removing an actor moves the last actor into its slot, so
+    slots are not stable.  Actors are referred to by generational integer
+    handles instead: the low bits index a table of slots and the high bits
+    hold a generation which is incremented when an actor is removed, so a
+    stale handle can be detected in O(1).
+    """
+
+    COLUMNS = {
+        "x": np.int32,
+        "y": np.int32,
+        "look_x": np.int8,
+        "look_y": np.int8,
+        "hp": np.int32,
+        "max_hp": np.int32,
+        "power": np.int32,
+        "defense": np.int32,
+        "speed": np.int32,
+    }
+    FIGHTER_COLUMNS = ("hp", "max_hp", "power", "defense", "speed")
+
+    x: np.ndarray
+    y: np.ndarray
+    look_x: np.ndarray
+    look_y: np.ndarray
+    hp: np.ndarray
+    max_hp: np.ndarray
+    power: np.ndarray
+    defense: np.ndarray
+    speed: np.ndarray
+
+    def __init__(self, capacity: int = 64) -> None:
+        self.capacity = capacity
+        self.count = 0  # Number of live actors.
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.objects: List[Actor] = []  # Live actors, in slot order.
+        self.slot_handles: List[int] = []  # The handle of each slot.
+        # Indexed by the low bits of a handle.
+        self.handle_slots: List[int] = []
+        self.generations: List[int] = []
+        self.free_indexes: List[int] = []
+
+    def _grow(self) -> None:
+        """Double the capacity of every column."""
+        self.capacity *= 2
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=column.dtype)
+            grown[: self.count] = column[: self.count]
+            setattr(self, name, grown)
+
+    def add(self, actor: Actor, xy: Tuple[int, int], fighter: Fighter) -> int:
+        """Add `actor` to the registry and return its new handle."""
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        self.count += 1
+        if self.free_indexes:
+            index = self.free_indexes.pop()
+            self.handle_slots[index] = slot
+        else:
+            index = len(self.handle_slots)
+            self.handle_slots.append(slot)
+            self.generations.append(0)
+        handle = index | self.generations[index] << INDEX_BITS
+        self.objects.append(actor)
+        self.slot_handles.append(handle)
+        self.x[slot], self.y[slot] = xy
+        self.look_x[slot], self.look_y[slot] = 1, 0
+        for name in self.FIGHTER_COLUMNS:
+            getattr(self, name)[slot] = getattr(fighter, name)
+        return handle
+
+    def remove(self, handle: int) -> None:
+        """Remove the actor of `handle`, invalidating the handle."""
+        slot = self.slot_of(handle)
+        assert slot >= 0, "Handle is stale."
+        last = self.count - 1
+        if slot != last:
+            # Move the last actor into the removed actors slot.
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[slot] = column[last]
+            moved_handle = self.slot_handles[last]
+            self.objects[slot] = self.objects[last]
+            self.slot_handles[slot] = moved_handle
+            self.handle_slots[moved_handle & INDEX_MASK] = slot
+        self.objects.pop()
+        self.slot_handles.pop()
+        self.count = last
+        index = handle & INDEX_MASK
+        self.generations[index] += 1
+        self.free_indexes.append(index)
+
+    def slot_of(self, handle: int) -> int:
+        """Return the current slot of `handle`, or -1 if the handle is stale."""
+        index = handle & INDEX_MASK
+        if self.generations[index] != handle >> INDEX_BITS:
+            return -1
+        return self.handle_slots[index]
+
+    def get(self, handle: int) -> Optional[Actor]:
+        """Return the actor of `handle`, or None if the handle is stale."""
+        slot = self.slot_of(handle)
+        return self.objects[slot] if slot >= 0 else None
+
+    def act(self, handle: int, scheduler: TurnQueue, ticket: Ticket) -> None:
+        """Run the turn of the actor of `handle`, dropping stale tickets."""
+        actor = self.get(handle)
+        if actor is None:
+            return scheduler.unschedule(ticket)
+        actor.act(scheduler, ticket)
+
+    def slots_at(self, x: int, y: int) -> np.ndarray:
+        """Return the slots of all actors at x,y."""
+        count = self.count
+        return np.flatnonzero((self.x[:count] == x) & (self.y[:count] == y))
+
+    def actor_at(self, x: int, y: int) -> Optional[Actor]:
+        """Return the first actor at x,y, or None."""
+        slots = self.slots_at(x, y)
+        return self.objects[slots[0]] if slots.size else None
+
+    def occupied(self, shape: Tuple[int, int]) -> np.ndarray:
+        """Return a boolean array of `shape` which is True where actors are."""
+        mask = np.zeros(shape, dtype=bool, order="F")
+        mask[self.x[: self.count], self.y[: self.count]] = True
+        return mask
+
+    def slot_grid(self, shape: Tuple[int, int]) -> np.ndarray:
+        """Return the slot of the actor on each cell of `shape`, or -1."""
+        grid = np.full(shape, -1, dtype=np.int32, order="F")
+        grid[self.x[: self.count], self.y[: self.count]] = np.arange(self.count)
+        return grid
+
+    def slots_within(self, x: int, y: int, radius: int) -> np.ndarray:
+        """Return the slots of actors within `radius` steps of x,y."""
+        count = self.count
+        distance = np.maximum(abs(self.x[:count] - x), abs(self.y[:count] - y))
+        return np.flatnonzero(distance <= radius)
+
+    def nearest(
+        self, x: int, y: int, mask: np.ndarray, exclude: Optional[Actor] = None
+    ) -> Optional[Actor]:
+        """Return the actor nearest to x,y standing on a True cell of `mask`.
+
+        Distance is counted in steps, ties go to the lowest slot.
+        """
+        count = self.count
+        candidates = mask[self.x[:count], self.y[:count]]
+        if exclude is not None and self.slot_of(exclude.handle) >= 0:
+            candidates[self.slot_of(exclude.handle)] = False
+        slots = np.flatnonzero(candidates)
+        if not slots.size:
+            return None
+        distance = np.maximum(abs(self.x[slots] - x), abs(self.y[slots] - y))
+        return self.objects[int(slots[distance.argmin()])]
+
+
+class ActorTurn:
+    """A scheduled turn, refers to its actor by handle."""
+
+    def __init__(self, store: ActorStore, handle: int) -> None:
+        self.store = store
+        self.handle = handle
+
+    def __call__(self, scheduler: TurnQueue, ticket: Ticket) -> None:
+        self.store.act(self.handle, scheduler, ticket)
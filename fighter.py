@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Type
+from typing import TYPE_CHECKING, Dict, Optional, Type, overload
 
 import actor
 import graphic
@@ -11,20 +11,89 @@
     from location import Location
 
 
+class StoreStat:
+    """A Fighter stat held in the actor store column of the same name.
+
+    While the fighter has no actor the value is kept on the fighter instead.
+    Assigning hp or max_hp bumps the fighters `version`.
+    """
+
+    def __set_name__(self, owner: Type[Fighter], name: str) -> None:
+        self.name = name
+        self.observed = name in ("hp", "max_hp")
+
+    @overload
+    def __get__(self, fighter: None, owner: Type[Fighter]) -> StoreStat:
+        ...
+
+    @overload
+    def __get__(self, fighter: Fighter, owner: Type[Fighter]) -> int:
+        ...
+
+    def __get__(self, fighter: Optional[Fighter], owner: Type[Fighter]) -> object:
+        if fighter is None:
+            return self
+        entity = fighter.entity
+        if entity is None:
+            return fighter.detached_stats[self.name]
+        store = entity.map.actor_store
+        return int(getattr(store, self.name)[store.slot_of(entity.handle)])
+
+    def __set__(self, fighter: Fighter, value: int) -> None:
+        entity = fighter.entity
+        if entity is None:
+            fighter.detached_stats[self.name] = value
+        else:
+            store = entity.map.actor_store
+            getattr(store, self.name)[store.slot_of(entity.handle)] = value
+        if self.observed:
+            fighter.version += 1
+
+
 class Fighter(graphic.Graphic):
+    __slots__ = ("detached_stats", "inventory", "entity", "version")
+
     render_order = 0
 
-    hp: int = 0
-    power: int = 0
-    defense: int = 0
-    speed: int = 100
+    # The starting stats of each kind of fighter.
+    base_hp = 0
+    base_power = 0
+    base_defense = 0
+    base_speed = 100
+
+    hp = StoreStat()
+    max_hp = StoreStat()
+    power = StoreStat()
+    defense = StoreStat()
+    speed = StoreStat()
 
     DEFAULT_AI: Type[AI] = BasicMonster
 
     def __init__(self, inventory: Optional[Inventory] = None) -> None:
-        self.max_hp = self.hp
+        self.version = 0  # Incremented whenever hp or max_hp is assigned.
+        self.entity: Optional[actor.Actor] = None  # The actor of this fighter.
+        # Stats live here until the fighter is attached to an actor.
+        self.detached_stats: Dict[str, int] = {
+            "hp": self.base_hp,
+            "max_hp": self.base_hp,
+            "power": self.base_power,
+            "defense": self.base_defense,
+            "speed": self.base_speed,
+        }
         self.inventory = inventory or Inventory()
 
+    def attach(self, entity: actor.Actor) -> None:
+        """Keep stats in the store slot of `entity`, filled by ActorStore.add."""
+        self.entity = entity
+
+    def detach(self) -> None:
+        """Copy the stats out of the store, before the actor is removed."""
+        assert self.entity is not None
+        self.detached_stats = {
+            name: getattr(self, name) for name in self.detached_stats
+        }
+        self.entity = None
+
     @classmethod
     def spawn(
         cls, location: Location, ai_cls: Optional[Type[AI]] = None
@@ -34,42 +103,50 @@ def spawn(
 
 
 class Player(Fighter):
+    __slots__ = ()
+
     name = "You"
     char = ord("@")
     color = (255, 255, 255)
 
-    hp = 30
-    power = 5
-    defense = 2
+    base_hp = 30
+    base_power = 5
+    base_defense = 2
 
 
 class Orc(Fighter):
+    __slots__ = ()
+
     name = "Orc"
     char = ord("o")
     color = (63, 127, 63)
 
-    hp = 10
-    power = 3
-    defense = 0
+    base_hp = 10
+    base_power = 3
+    base_defense = 0
 
 
 class Troll(Fighter):
+    __slots__ = ()
+
     name = "Troll"
     char = ord("T")
     color = (0, 127, 0)
 
-    hp = 16
-    power = 4
-    defense = 1
+    base_hp = 16
+    base_power = 4
+    base_defense = 1
 
 
 class Guard(Fighter):
+    __slots__ = ()
+
     name = "Guard"
     char = ord("U")
     color = (255, 255, 255)
     DEFAULT_AI: Type[AI] = GuardAI
 
-    hp = 10
-    power = 3
-    defense = 0
-    speed = 200
+    base_hp = 10
+    base_power = 3
+    base_defense = 0
+    base_speed = 200
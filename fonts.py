@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+from typing import List
+
+import numpy as np
+import tcod.image
+import tcod.tileset
+
+FONT_PATH = "data/cp437-14.png"
+FONT_COLUMNS, FONT_ROWS = 32, 8
+CACHE_DIRECTORY = "data/cache"
+
+# The Unicode codepoint of each glyph of a CP437 tilesheet, in sheet order.
+CHARMAP_CP437: List[int] = (
+    [ord(c) for c in "\0☺☻♥♦♣♠•◘○◙♂♀♪♫☼►◄↕‼¶§▬↨↑↓→←∟↔▲▼"]
+    + list(range(0x20, 0x7F))
+    + [ord("⌂")]
+    + [ord(c) for c in bytes(range(0x80, 0x100)).decode("cp437")]
+)
+
+
+def _source_stamp(path: str) -> np.ndarray:
+    """Return the size and mtime of `path`, used to invalidate the cache."""
+    stat = os.stat(path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def decode_tilesheet(path: str) -> np.ndarray:
+    """Decode a tilesheet image into an alpha array indexed by [glyph, y, x].
+
+    Like libtcod, images without transparency use their brightness as alpha.
+    """
+    image = np.asarray(tcod.image.load(path))
+    if image.shape[2] == 4 and (image[..., 3] != 255).any():
+        alpha = image[..., 3]
+    else:
+        alpha = image[..., :3].max(axis=2)
+    height, width = alpha.shape
+    tile_height, tile_width = height // FONT_ROWS, width // FONT_COLUMNS
+    return np.ascontiguousarray(
+        alpha.reshape(FONT_ROWS, tile_height, FONT_COLUMNS, tile_width)
+        .transpose(0, 2, 1, 3)
+        .reshape(FONT_ROWS * FONT_COLUMNS, tile_height, tile_width)
+    )
+
+
+def load_tiles(path: str = FONT_PATH) -> np.ndarray:
+    """Return the decoded glyphs of `path`, from the cache when it's current."""
+    stamp = _source_stamp(path)
+    cache_path = os.path.join(
+        CACHE_DIRECTORY, os.path.splitext(os.path.basename(path))[0] + ".npz"
+    )
+    try:
+        with np.load(cache_path) as data:
+            if (data["stamp"] == stamp).all():
+                cached: np.ndarray = data["tiles"]
+                return cached
+    except (OSError, KeyError, ValueError):
+        pass  # Missing or unreadable.
+    tiles = decode_tilesheet(path)
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.savez(file, tiles=tiles, stamp=stamp)
+    os.replace(tmp_path, cache_path)
+    return tiles
+
+
+def set_font(path: str = FONT_PATH) -> tcod.tileset.Tileset:
+    """Set the font used by the next console_init_root call and return it.
+
+    The decoded glyphs are cached as an uncompressed .npz file, which loads
+    faster than decoding the PNG.
+    """
+    tiles = load_tiles(path)
+    tileset = tcod.tileset.Tileset(tiles.shape[2], tiles.shape[1])
+    for codepoint, tile in zip(CHARMAP_CP437, tiles):
+        tileset.set_tile(codepoint, tile)
+    tcod.tileset.set_default(tileset)
+    return tileset
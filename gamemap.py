@@ -1,19 +1,22 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 import numpy as np
 import tcod.map
 from tcod import libtcodpy
 
+from actor import Actor
+from components import ActorStore
 from location import Location
+from pathing import PathService
+from telemetry import profiler
 from tqueue import TurnQueue
 
 if TYPE_CHECKING:
     import tcod.console
 
-    from actor import Actor
     from graphic import Graphic
     from item import Item
     from model import Model
@@ -41,7 +44,26 @@ class Tile(NamedTuple):
     memory: Tuple[int, Tuple[int, int, int], Tuple[int, int, int]]
 
 
+def sample_cells(
+    rng: np.random.Generator,
+    mask: np.ndarray,
+    number: int,
+    origin: Tuple[int, int] = (0, 0),
+) -> List[Tuple[int, int]]:
+    """Return up to `number` distinct x,y positions where `mask` is True.
+
+    The positions are drawn without replacement in a single call.  `origin`
+    is added to every position, for masks of a sub-region of a map.
+    """
+    free = np.flatnonzero(mask.ravel(order="F"))
+    chosen = rng.choice(free, size=min(number, free.size), replace=False)
+    xs, ys = np.unravel_index(chosen, mask.shape, order="F")
+    return list(zip((xs + origin[0]).tolist(), (ys + origin[1]).tolist()))
+
+
 class MapLocation(Location):
+    __slots__ = ("map", "x", "y")
+
     def __init__(self, gamemap: GameMap, x: int, y: int):
         self.map = gamemap
         self.x = x
@@ -63,10 +85,70 @@ def __init__(self, width: int, height: int):
         self.tiles = np.zeros(self.shape, dtype=tile_dt, order="F")
         self.explored = np.zeros(self.shape, dtype=bool, order="F")
         self.visible = np.zeros(self.shape, dtype=bool, order="F")
-        self.actors: List[Actor] = []
+        self.actor_store = ActorStore()
+        self._locations: Dict[Tuple[int, int], MapLocation] = {}
+        # Actors further than this many steps from the player and out of
+        # the players view are dormant, None disables dormancy.  Dormant
+        # actors act less often, which changes gameplay, so it's opt-in.
+        self.ai_lod_radius: Optional[int] = None
+        self.ai_lod_max_interval = 2000  # The longest dormant reschedule.
+        # Bytes of arrays allowed before memory.enforce_budget evicts caches.
+        self.memory_budget: Optional[int] = None
         self.items: Dict[Tuple[int, int], List[Item]] = {}
         self.camera_xy = (0, 0)  # Camera center position.
+        # The last rendered region: x, y, width, height.
+        self.view_rect = 0, 0, width, height
         self.scheduler = TurnQueue()
+        self.path_service = PathService(self)
+        # The slot of the actor on each cell, or -1, while batch.invoke_batch
+        # holds back position updates.  None when the store is up to date.
+        self.occupancy: Optional[np.ndarray] = None
+
+    @property
+    def actors(self) -> Sequence[Actor]:
+        """The live actors on this map.  Must not be modified directly."""
+        return self.actor_store.objects
+
+    def is_dormant(self, actor: Actor) -> bool:
+        """Return True if `actor` should run a coarse dormant AI this turn."""
+        if self.ai_lod_radius is None or actor is self.player:
+            return False
+        location = actor.location
+        if self.visible[location.xy]:
+            return False
+        return location.distance_to(*self.player.location.xy) > self.ai_lod_radius
+
+    def dormant_interval(self, actor: Actor) -> int:
+        """Return how long a dormant actor can sleep.
+
+        This is short enough that the player can not get within
+        `ai_lod_radius` before the actor wakes and is promoted to full AI.
+        """
+        assert self.ai_lod_radius is not None
+        gap = actor.location.distance_to(*self.player.location.xy) - self.ai_lod_radius
+        interval = gap * self.player.fighter.speed
+        return max(actor.fighter.speed, min(interval, self.ai_lod_max_interval))
+
+    def screen_to_world(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """Return the map position rendered at x,y of the last view, or None."""
+        cam_x, cam_y, view_width, view_height = self.view_rect
+        if 0 <= x < view_width and 0 <= y < view_height:
+            return cam_x + x, cam_y + y
+        return None
+
+    def slots_near_view(self) -> np.ndarray:
+        """Return the slots of actors whose sight can reach the last view."""
+        store = self.actor_store
+        cam_x, cam_y, view_width, view_height = self.view_rect
+        reach = int(Actor.FOV_RADIUS) + 1
+        x = store.x[: store.count]
+        y = store.y[: store.count]
+        return np.flatnonzero(
+            (x >= cam_x - reach)
+            & (x < cam_x + view_width + reach)
+            & (y >= cam_y - reach)
+            & (y < cam_y + view_height + reach)
+        )
 
     def is_blocked(self, x: int, y: int) -> bool:
         """Return True if this position is impassible."""
@@ -74,18 +156,59 @@ def is_blocked(self, x: int, y: int) -> bool:
             return True
         if not self.tiles[x, y]["move_cost"]:
             return True
-        if any(actor.location.xy == (x, y) for actor in self.actors):
+        if self.occupancy is not None:
+            return bool(self.occupancy[x, y] >= 0)
+        if self.actor_store.slots_at(x, y).size:
             return True
 
         return False
 
+    def occupied(self) -> np.ndarray:
+        """Return a boolean array which is True where actors are."""
+        if self.occupancy is not None:
+            return self.occupancy >= 0
+        return self.actor_store.occupied(self.shape)
+
+    def free_mask(
+        self, index: Tuple[slice, slice], allow_items: bool = True
+    ) -> np.ndarray:
+        """Return a mask of the walkable and unoccupied cells within `index`.
+
+        `index` is a pair of slices with explicit starts.  If `allow_items` is
+        False then cells holding items are also excluded.
+        """
+        mask: np.ndarray = self.tiles["move_cost"][index] != 0
+        x0, y0 = index[0].start, index[1].start
+        width, height = mask.shape
+        mask &= ~self.occupied()[index]
+        if not allow_items:
+            for x, y in self.items:
+                if 0 <= x - x0 < width and 0 <= y - y0 < height:
+                    mask[x - x0, y - y0] = False
+        return mask
+
+    def sample_free(
+        self,
+        rng: np.random.Generator,
+        index: Tuple[slice, slice],
+        number: int,
+        allow_items: bool = True,
+    ) -> List[Tuple[int, int]]:
+        """Return up to `number` distinct free x,y positions within `index`.
+
+        Fewer positions are returned only if there are not enough free cells.
+        """
+        mask = self.free_mask(index, allow_items)
+        return sample_cells(rng, mask, number, (index[0].start, index[1].start))
+
     def fighter_at(self, x: int, y: int) -> Optional[Actor]:
         """Return any fighter entity found at this position."""
-        for actor in self.actors:
-            if actor.location.xy == (x, y):
-                return actor
-        return None
+        if self.occupancy is not None:
+            slot = int(self.occupancy[x, y])
+            return self.actor_store.objects[slot] if slot >= 0 else None
+        return self.actor_store.actor_at(x, y)
 
+    @profiler.timed("update_fov")
     def update_fov(self) -> None:
         """Update the field of view around the player."""
         if not self.player.location:
@@ -99,6 +222,7 @@ def update_fov(self) -> None:
         )
         self.explored |= self.visible
 
+    @profiler.timed("map_render")
     def render(self, console: tcod.console.Console) -> None:
         """Render this maps contents onto a console."""
         # Get the view size from the window size or world size,
@@ -115,8 +239,11 @@ def render(self, console: tcod.console.Console) -> None:
         screen_view = np.s_[:view_width, :view_height]
         world_view = np.s_[cam_x : cam_x + view_width, cam_y : cam_y + view_height]
 
+        self.view_rect = cam_x, cam_y, view_width, view_height
+        store = self.actor_store
         enemy_fov = np.zeros((view_width, view_height), dtype=bool)
-        for actor in self.actors:
+        for slot in self.slots_near_view().tolist():
+            actor = store.objects[slot]
             if actor is self.player:
                 continue
             enemy_fov |= actor.fov[world_view]
@@ -135,13 +262,20 @@ def render(self, console: tcod.console.Console) -> None:
 
         # Collect and filter the various entity objects.
         visible_objs: Dict[Tuple[int, int], List[Graphic]] = defaultdict(list)
-        for obj in self.actors:
-            obj_x, obj_y = obj.location.x - cam_x, obj.location.y - cam_y
-            if not (0 <= obj_x < view_width and 0 <= obj_y < view_height):
-                continue
-            if not self.visible[obj.location.xy]:
-                continue
-            visible_objs[obj_x, obj_y].append(obj.fighter)
+        screen_x = store.x[: store.count] - cam_x
+        screen_y = store.y[: store.count] - cam_y
+        on_screen = (
+            (0 <= screen_x)
+            & (screen_x < view_width)
+            & (0 <= screen_y)
+            & (screen_y < view_height)
+        )
+        slots = np.flatnonzero(on_screen)
+        slots = slots[self.visible[store.x[slots], store.y[slots]]]
+        for slot, obj_x, obj_y in zip(
+            slots.tolist(), screen_x[slots].tolist(), screen_y[slots].tolist()
+        ):
+            visible_objs[obj_x, obj_y].append(store.objects[slot].fighter)
         for (item_x, item_y), items in self.items.items():
             obj_x, obj_y = item_x - cam_x, item_y - cam_y
             if not (0 <= obj_x < view_width and 0 <= obj_y < view_height):
@@ -156,4 +290,9 @@ def render(self, console: tcod.console.Console) -> None:
             console.tiles_rgb[["ch", "fg"]][xy] = graphic.char, graphic.color
 
     def __getitem__(self, key: Tuple[int, int]) -> MapLocation:
-        return MapLocation(self, *key)
+        """Return the shared MapLocation for the x,y position `key`."""
+        try:
+            return self._locations[key]
+        except KeyError:
+            location = self._locations[key] = MapLocation(self, *key)
+            return location
@@ -4,6 +4,8 @@
 
 
 class Graphic:
+    __slots__ = ()
+
     name: str = "<Unnamed>"
     char: int = ord("!")
     color: Tuple[int, int, int] = (255, 255, 255)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
+import tcod.console
+
+import rendering
+
+if TYPE_CHECKING:
+    from model import Model
+
+
+class HeadlessRenderer:
+    """Renders the main view into an off-screen console.
+
+    This needs no window or display, so it can be used for benchmarks,
+    golden-frame tests, or spectator output.
+    """
+
+    def __init__(self, width: int = 80, height: int = 50) -> None:
+        self.console = tcod.console.Console(width, height, order="F")
+        self.last_ansi_frame: Optional[np.ndarray] = None  # For diffed output.
+
+    def render(self, model: Model) -> np.ndarray:
+        """Draw `model` and return a copy of the frame as a tiles_rgb array.
+
+        The array is indexed by [x, y].
+        """
+        rendering.draw_main_view(model, self.console)
+        frame: np.ndarray = self.console.tiles_rgb.copy()
+        return frame
+
+    def render_ansi(self, model: Model) -> str:
+        """Draw `model` and return the ANSI text which updates a terminal.
+
+        Only the cells which changed since the last call are included.
+        """
+        frame = self.render(model)
+        text = to_ansi(frame, self.last_ansi_frame)
+        self.last_ansi_frame = frame
+        return text
+
+
+def to_ansi(frame: np.ndarray, previous: Optional[np.ndarray] = None) -> str:
+    """Return 24-bit color ANSI escape codes which draw `frame` on a terminal.
+
+    If `previous` is given then only cells which differ from it are drawn.
+    """
+    if previous is None or previous.shape != frame.shape:
+        changed = np.ones(frame.shape, dtype=bool)
+        out: List[str] = ["\x1b[0m\x1b[2J"]
+    else:
+        changed = frame != previous
+        out = []
+    ys, xs = np.nonzero(changed.T)  # Row-major order.
+    cursor = None
+    fg = bg = None
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        if cursor != (x, y):
+            out.append(f"\x1b[{y + 1};{x + 1}H")
+        ch, cell_fg, cell_bg = frame[x, y]
+        cell_fg = tuple(cell_fg.tolist())
+        cell_bg = tuple(cell_bg.tolist())
+        if cell_fg != fg:
+            out.append("\x1b[38;2;%d;%d;%dm" % cell_fg)
+            fg = cell_fg
+        if cell_bg != bg:
+            out.append("\x1b[48;2;%d;%d;%dm" % cell_bg)
+            bg = cell_bg
+        out.append(chr(ch) if ch >= 0x20 else " ")
+        cursor = x + 1, y
+    if out:
+        out.append(f"\x1b[0m\x1b[{frame.shape[1] + 1};1H")
+    return "".join(out)
+
+
+def main() -> None:
+    import procgen
+    from model import Model
+
+    model_ = Model()
+    model_.active_map = procgen.generate(100, 100)
+    model_.active_map.model = model_
+    sys.stdout.write(HeadlessRenderer().render_ansi(model_))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,14 +13,21 @@ class Inventory:
 
     def __init__(self) -> None:
         self.contents: List[Item] = []
+        self.version = 0  # Incremented whenever contents changes.
 
     def take(self, item: Item) -> None:
         """Take an item from its current location and put it in self."""
         assert item.owner is not self
         item.lift()
         self.contents.append(item)
+        self.version += 1
         item.owner = self
 
+    def remove(self, item: Item) -> None:
+        """Remove an item from contents.  Use Item.lift instead of this."""
+        self.contents.remove(item)
+        self.version += 1
+
     def list_item_descriptions(self) -> Iterator[str]:
         for key, item in itertools.zip_longest(self.symbols, self.contents):
             if item:
@@ -13,6 +13,8 @@
 
 
 class Item(graphic.Graphic):
+    __slots__ = ("owner", "location")
+
     render_order = 1
 
     def __init__(self) -> None:
@@ -22,7 +24,7 @@ def __init__(self) -> None:
     def lift(self) -> None:
         """Remove this item from any of its containers."""
         if self.owner:
-            self.owner.contents.remove(self)
+            self.owner.remove(self)
             self.owner = None
         if self.location:
             item_list = self.location.map.items[self.location.xy]
@@ -57,6 +59,8 @@ def consume(self, action: ActionWithItem) -> None:
 
 
 class Potion(Item):
+    __slots__ = ("my_effect",)
+
     name = "Potion"
     char = ord("!")
     color = (255, 255, 255)
@@ -71,6 +75,8 @@ def activate(self, action: ActionWithItem) -> None:
 
 
 class HealingPotion(Potion):
+    __slots__ = ()
+
     name = "Healing Potion"
     color = (64, 0, 64)
 
@@ -79,6 +85,8 @@ def __init__(self) -> None:
 
 
 class Corpse(Item):
+    __slots__ = ("name",)
+
     char = ord("%")
     color = (127, 0, 0)
     render_order = 2
@@ -89,6 +97,8 @@ def __init__(self, actor: Actor) -> None:
 
 
 class Firearm(Item):
+    __slots__ = ("ammo",)
+
     name = "<Firearm>"
     char = ord("¬")
     color = (0x7F, 0x7F, 0x7F)
@@ -100,6 +110,8 @@ def __init__(self) -> None:
 
 
 class Pistol(Firearm):
+    __slots__ = ()
+
     name = "Pistol"
 
     def activate(self, action: ActionWithItem) -> None:
@@ -107,17 +119,11 @@ def activate(self, action: ActionWithItem) -> None:
             action.report(f"The {self.name} is out of ammo!")
             return
         self.ammo -= 1
-        enemies = []
-        for target in action.actor.location.map.actors:
-            if target is action.actor:
-                continue
-            if not action.actor.location.map.visible[target.location.xy]:
-                continue
-            enemies.append(
-                (action.actor.location.distance_to(*target.location.xy), target)
-            )
-        if enemies:
-            target = min(enemies)[1]
+        map_ = action.actor.location.map
+        target = map_.actor_store.nearest(
+            *action.actor.location.xy, map_.visible, exclude=action.actor
+        )
+        if target:
             action.report(f"You shoot the {target.fighter.name}.")
             action.kill_actor(target)
         else:
@@ -7,6 +7,10 @@
 
 
 class Location:
+    """A position on a map.  Locations are shared and must not be modified."""
+
+    __slots__ = ()
+
     map: gamemap.GameMap
     x: int
     y: int
@@ -15,10 +19,6 @@ class Location:
     def xy(self) -> Tuple[int, int]:
         return self.x, self.y
 
-    @xy.setter
-    def xy(self, xy: Tuple[int, int]) -> None:
-        self.x, self.y = xy
-
     def distance_to(self, x: int, y: int) -> int:
         """Return the approximate number of steps needed to reach x,y."""
         return max(abs(self.x - x), abs(self.y - y))
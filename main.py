@@ -1,20 +1,60 @@
 #!/usr/bin/env python3
+"""Start the game.
+
+Everything but the standard library is imported inside main so that
+START_TIME is taken before tcod and numpy are loaded.  Modules which aren't
+needed for the first frame, starting with state, are imported after it has
+been presented.
+"""
+from __future__ import annotations
+
 import sys
+import time
 import warnings
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tcod.console
+
+    import telemetry
+
+START_TIME = time.perf_counter()  # For startup timing.
+
 
-from tcod import libtcodpy
+def draw_loading(console: tcod.console.Console, text: str) -> None:
+    """Present a frame with `text` in the middle of the screen."""
+    from tcod import libtcodpy
 
-import model
-import procgen
-import state
+    console.clear()
+    console.print(
+        console.width // 2, console.height // 2, text, alignment=libtcodpy.CENTER
+    )
+    libtcodpy.console_flush(console)
+
+
+def report_startup(startup: telemetry.StartupTimer) -> None:
+    """Report startup times once the game has drawn its first frame."""
+    startup.mark("first_game_frame")
+    if "--startup-stats" in sys.argv:
+        startup.dump(sys.stderr)
+    if "--startup-only" in sys.argv:
+        raise SystemExit()
 
 
 def main() -> None:
     screen_width = 80
     screen_height = 50
     map_width, map_height = 100, 100
+    from tcod import libtcodpy
+
+    import fonts
+    import telemetry
 
-    libtcodpy.console_set_custom_font("data/cp437-14.png", libtcodpy.FONT_LAYOUT_CP437, 32, 8)
+    startup = telemetry.StartupTimer(START_TIME)
+    startup.mark("imports")
+
+    fonts.set_font()
+    startup.mark("font")
 
     with libtcodpy.console_init_root(
         screen_width,
@@ -23,11 +63,71 @@ def main() -> None:
         renderer=libtcodpy.RENDERER_SDL2,
         vsync=True,
         order="F",
-    ) as state.g_console:
+    ) as console:
+        startup.mark("window")
+        draw_loading(console, "Generating map...")
+        startup.mark("first_frame")
+        import background
+        import mapcache
+        import model
+        import pregen
+        import state
+
+        state.g_console = console
+        startup.mark("game_imports")
+        if "--spectate" in sys.argv:
+            import spectator
+
+            address = sys.argv[sys.argv.index("--spectate") + 1]
+            server = spectator.SpectatorServer(spectator.parse_address(address))
+            state.g_frame_hooks.append(
+                lambda console: server.publish(console.tiles_rgb)
+            )
+        if "--profile-scopes" in sys.argv:
+            path = sys.argv[sys.argv.index("--profile-scopes") + 1]
+            telemetry.profiler.export_file = open(path, "a")
+            telemetry.profiler.enabled = True
+        if "--memory-report" in sys.argv:
+            import tracemalloc
+
+            tracemalloc.start()
+        if "--seed" in sys.argv:
+            # Floors of a fixed seed repeat between runs, so they're cached.
+            seed = int(sys.argv[sys.argv.index("--seed") + 1])
+            floor_pool = pregen.FloorPool(
+                map_width, map_height, seed=seed, cache=mapcache.MapCache()
+            )
+        else:
+            floor_pool = pregen.FloorPool(map_width, map_height)
         model_ = model.Model()
-        model_.active_map = procgen.generate(map_width, map_height)
+        model_.floor_pool = floor_pool
+        # The first floor is generated here, a worker process would take
+        # longer to start than generating it does.  The next floors are
+        # generated in the background once the game is waiting for input.
+        model_.active_map = floor_pool.next_floor()
         model_.active_map.model = model_
-        model_.loop()
+        startup.mark("map_ready")
+
+        def on_first_game_frame(console: tcod.console.Console) -> None:
+            state.g_frame_hooks.remove(on_first_game_frame)
+            report_startup(startup)
+
+        state.g_frame_hooks.append(on_first_game_frame)
+        if "--memory-budget" in sys.argv:
+            mib = float(sys.argv[sys.argv.index("--memory-budget") + 1])
+            model_.active_map.memory_budget = int(mib * 2 ** 20)
+        try:
+            model_.loop()
+        finally:
+            background.shutdown()
+            floor_pool.close()
+            telemetry.profiler.close_export()
+            if "--memory-report" in sys.argv:
+                import json
+
+                import memory
+
+                json.dump(memory.report(model_), sys.stderr, indent=2)
 
 
 if __name__ == "__main__":
@@ -45,5 +145,12 @@ def main() -> None:
             stats.strip_dirs()
             stats.sort_stats("time")
             stats.print_stats(40)
+    elif "--frame-stats" in sys.argv:
+        from telemetry import frame_stats
+
+        try:
+            main()
+        finally:
+            frame_stats.dump(sys.stderr)
     else:
         main()
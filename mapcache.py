@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import zipfile
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+import procgen
+
+CACHE_DIRECTORY = "data/cache/layouts"
+
+
+class MapCache:
+    """A size bounded on-disk cache of generated floor layouts.
+
+    Entries are compressed .npz files named by a hash of the seed, the map
+    size, procgen.GENERATOR_VERSION and the generator parameters.  When the
+    cache grows past `max_bytes` the least recently used entries are removed.
+    """
+
+    def __init__(
+        self, directory: str = CACHE_DIRECTORY, max_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path_for(self, width: int, height: int, seed: int, **params: Any) -> str:
+        """Return the cache file path for these generator arguments."""
+        key: Dict[str, Any] = {
+            "version": procgen.GENERATOR_VERSION,
+            "width": width,
+            "height": height,
+            "seed": seed,
+            "params": params,
+        }
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.npz")
+
+    def get(
+        self, width: int, height: int, seed: int, **params: Any
+    ) -> Optional[procgen.Layout]:
+        """Return the cached Layout for these arguments, or None."""
+        path = self.path_for(width, height, seed, **params)
+        try:
+            with np.load(path) as data:
+                layout = procgen.Layout(
+                    np.asfortranarray(data["tiles"]), data["spawns"]
+                )
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None  # Missing, unreadable or truncated.
+        os.utime(path)  # Mark as recently used.
+        return layout
+
+    def put(
+        self, layout: procgen.Layout, width: int, height: int, seed: int, **params: Any
+    ) -> None:
+        """Store a Layout, then evict old entries if over the size limit."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(width, height, seed, **params)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez_compressed(file, tiles=layout.tiles, spawns=layout.spawns)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under `max_bytes`."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Removed by another process.
+            total -= size
+
+    def generate_layout(
+        self, width: int, height: int, seed: int, max_rooms: int = 30
+    ) -> procgen.Layout:
+        """Return a cached Layout, generating and storing it on a cache miss."""
+        layout = self.get(width, height, seed, max_rooms=max_rooms)
+        if layout is None:
+            layout = procgen.generate_layout(width, height, seed, max_rooms)
+            self.put(layout, width, height, seed, max_rooms=max_rooms)
+        return layout
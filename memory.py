@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import collections
+import os
+import sys
+import tracemalloc
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from gamemap import GameMap
+    from model import Model
+
+
+def array_usage(gamemap: GameMap) -> Dict[str, int]:
+    """Return the bytes used by the NumPy arrays of `gamemap`, per subsystem."""
+    store = gamemap.actor_store
+    return {
+        "tiles": gamemap.tiles.nbytes,
+        "masks": gamemap.explored.nbytes + gamemap.visible.nbytes,
+        "actor_store": sum(getattr(store, name).nbytes for name in store.COLUMNS),
+        "actor_fov": sum(
+            actor._fov.nbytes for actor in gamemap.actors if actor._fov is not None
+        ),
+    }
+
+
+def map_usage(gamemap: GameMap) -> Dict[str, int]:
+    """Return the bytes used by `gamemap`, per subsystem.
+
+    Python objects are counted shallowly with sys.getsizeof, so this is an
+    estimate, but the arrays which dominate large maps are exact.
+    """
+    usage = array_usage(gamemap)
+    usage["actors"] = sum(sys.getsizeof(actor) for actor in gamemap.actors)
+    usage["items"] = sys.getsizeof(gamemap.items) + sum(
+        sys.getsizeof(stack) + sum(sys.getsizeof(item) for item in stack)
+        for stack in gamemap.items.values()
+    )
+    locations = gamemap._locations
+    usage["locations"] = sys.getsizeof(locations) + sum(
+        sys.getsizeof(location) for location in locations.values()
+    )
+    heap = gamemap.scheduler.heap
+    usage["scheduler"] = sys.getsizeof(heap) + sum(
+        sys.getsizeof(ticket) for ticket in heap
+    )
+    return usage
+
+
+def model_usage(model: Model) -> Dict[str, int]:
+    """Return the bytes used by `model`, per subsystem."""
+    return {
+        "log": sys.getsizeof(model.log)
+        + sum(
+            sys.getsizeof(message) + sys.getsizeof(message.text)
+            for message in model.log
+        ),
+        "active_map": sum(map_usage(model.active_map).values()),
+    }
+
+
+def traced_usage(limit: Optional[int] = 20) -> Dict[str, int]:
+    """Return the bytes allocated by each module according to tracemalloc.
+
+    This is empty unless tracemalloc has been started.
+    """
+    if not tracemalloc.is_tracing():
+        return {}
+    usage: Dict[str, int] = collections.Counter()
+    for stat in tracemalloc.take_snapshot().statistics("filename"):
+        filename = stat.traceback[0].filename
+        usage[os.path.splitext(os.path.basename(filename))[0]] += stat.size
+    return dict(usage.most_common(limit))  # type: ignore
+
+
+def report(model: Model) -> Dict[str, Dict[str, int]]:
+    """Return all memory statistics for `model`."""
+    return {
+        "map": map_usage(model.active_map),
+        "model": model_usage(model),
+        "traced": traced_usage(),
+    }
+
+
+def enforce_budget(gamemap: GameMap) -> int:
+    """Evict cached data until the arrays of `gamemap` fit its memory budget.
+
+    The cached FOVs of actors which can't be seen from the last rendered view
+    are dropped, furthest first.  They are recomputed when next needed.
+    Returns the number of bytes freed.
+    """
+    if gamemap.memory_budget is None:
+        return 0
+    excess = sum(array_usage(gamemap).values()) - gamemap.memory_budget
+    if excess <= 0:
+        return 0
+    near_view = set(gamemap.slots_near_view().tolist())
+    cam_x, cam_y, view_width, view_height = gamemap.view_rect
+    center_x, center_y = cam_x + view_width // 2, cam_y + view_height // 2
+    candidates = [
+        actor
+        for slot, actor in enumerate(gamemap.actors)
+        if actor._fov is not None and slot not in near_view
+    ]
+    candidates.sort(key=lambda actor: -actor.location.distance_to(center_x, center_y))
+    freed = 0
+    for actor in candidates:
+        if freed >= excess:
+            break
+        assert actor._fov is not None
+        freed += actor._fov.nbytes
+        actor._fov = None
+    return freed
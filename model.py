@@ -1,24 +1,43 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+import textwrap
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+import batch
+import memory
 import states
 
 if TYPE_CHECKING:
     from actor import Actor
     from gamemap import GameMap
+    from pregen import FloorPool
 
 
 class Message:
+    __slots__ = ("text", "count", "_layout_key", "_layout")
+
     def __init__(self, text: str) -> None:
         self.text = text
         self.count = 1
+        self._layout_key: Optional[Tuple[str, int, int]] = None
+        self._layout: List[str] = []
 
     def __str__(self) -> str:
         if self.count > 1:
             return f"{self.text} (x{self.count})"
         return self.text
 
+    def wrap(self, width: int) -> List[str]:
+        """Return this message word-wrapped into lines of at most `width`.
+
+        The result is cached until `count` or `width` changes.
+        """
+        key = self.text, self.count, width
+        if key != self._layout_key:
+            self._layout = textwrap.wrap(str(self), width) or [""]
+            self._layout_key = key
+        return self._layout
+
 
 class Model:
     """The model contains everything from a session which should be saved."""
@@ -27,6 +46,10 @@ class Model:
 
     def __init__(self) -> None:
         self.log: List[Message] = []
+        self.log_version = 0  # Incremented whenever the log changes.
+        self.batch_ai = False  # Run same-tick AI turns with batch.invoke_batch.
+        # Generates the layouts of the next floors ahead of time, if set.
+        self.floor_pool: Optional[FloorPool] = None
 
     @property
     def player(self) -> Actor:
@@ -38,6 +61,7 @@ def report(self, text: str) -> None:
             self.log[-1].count += 1
         else:
             self.log.append(Message(text))
+        self.log_version += 1
 
     def is_player_dead(self) -> bool:
         """True if the player had died."""
@@ -48,4 +72,8 @@ def loop(self) -> None:
             if self.is_player_dead():
                 states.GameOver(self).loop()
                 continue
-            self.active_map.scheduler.invoke_next()
+            if self.batch_ai:
+                batch.invoke_batch(self.active_map)
+            else:
+                self.active_map.scheduler.invoke_next()
+            memory.enforce_budget(self.active_map)
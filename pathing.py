@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+import tcod.path
+
+from telemetry import profiler
+
+if TYPE_CHECKING:
+    from gamemap import GameMap
+
+Path = List[Tuple[int, int]]
+
+MAX_WORKERS = 2
+_executor: Optional[ThreadPoolExecutor] = None  # Shared by every map.
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool shared by every map."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix="path")
+    return _executor
+
+
+@profiler.timed("find_path")
+def find_path(
+    walkable: np.ndarray, start: Tuple[int, int], goal: Tuple[int, int]
+) -> Path:
+    """Return the A* path from `start` to `goal`, excluding `start`."""
+    return tcod.path.AStar(walkable).get_path(*start, *goal)
+
+
+class PathService:
+    """Runs path searches for a map in the background.
+
+    tcod's pathfinder releases the GIL, so searches run on a thread pool
+    while the turn continues.  Each search works on a copy of the map taken
+    when it was requested, with actors as obstacles.  Requests for the same
+    start and goal made while a search is in flight share its Future.
+
+    If `threaded` is False then searches run immediately instead, which
+    makes the results deterministic.
+    """
+
+    def __init__(self, gamemap: GameMap, threaded: bool = True) -> None:
+        self.map = gamemap
+        self.threaded = threaded
+        self.pending: Dict[Tuple[Tuple[int, int], Tuple[int, int]], Future[Path]] = {}
+
+    def walkable(self, goal: Tuple[int, int]) -> np.ndarray:
+        """Return the walkable array for a search towards `goal`."""
+        walkable = np.copy(self.map.tiles["move_cost"])
+        walkable[self.map.occupied()] = False
+        walkable[goal] = True
+        return walkable
+
+    def request(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Future[Path]:
+        """Return a Future for the path from `start` to `goal`."""
+        for key in [key for key, future in self.pending.items() if future.done()]:
+            del self.pending[key]
+        future = self.pending.get((start, goal))
+        if future is not None:
+            return future
+        if not self.threaded:
+            future = Future()
+            future.set_result(find_path(self.walkable(goal), start, goal))
+            return future
+        future = get_executor().submit(find_path, self.walkable(goal), start, goal)
+        self.pending[start, goal] = future
+        return future
+
+    def find(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Path:
+        """Return the path from `start` to `goal`, waiting for it if needed."""
+        return self.request(start, goal).result()
+
+
+def adopt_path(path: Path, xy: Tuple[int, int]) -> Optional[Path]:
+    """Return `path` made to continue from `xy`, or None if it can't be.
+
+    A path which finished after its actor moved on may start from an older
+    position.  It's trimmed to the steps after `xy` if it passes through
+    it, or kept as is if its first step is still next to `xy`.
+    """
+    if xy in path:
+        return path[path.index(xy) + 1 :]
+    if path and max(abs(path[0][0] - xy[0]), abs(path[0][1] - xy[1])) <= 1:
+        return path
+    return None
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import collections
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Optional, Type
+
+import numpy as np
+
+import ai
+import gamemap
+import procgen
+from mapcache import MapCache
+
+
+class FloorPool:
+    """Generates the layouts of upcoming floors ahead of time.
+
+    Layouts are generated in a worker process and returned as compact
+    arrays, so that building the next GameMap only needs to place the tiles
+    and spawn the entities.  `build_ready` does that ahead of time as well.
+    The worker is only started by `fill`, a layout asked for before then is
+    generated in this process instead.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        ahead: int = 2,
+        seed: Optional[int] = None,
+        max_workers: int = 1,
+        cache: Optional[MapCache] = None,
+        player_ai: Type[ai.AI] = ai.PlayerControl,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.ahead = ahead  # Number of floors to keep generating in advance.
+        self.seed_rng = np.random.default_rng(seed)
+        self.cache = cache  # Layouts are loaded from here when possible.
+        self.max_workers = max_workers
+        self.player_ai = player_ai
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending: Deque[Future[procgen.Layout]] = collections.deque()
+        self.ready: Deque[gamemap.GameMap] = collections.deque()  # Built floors.
+
+    def _next_seed(self) -> int:
+        return int(self.seed_rng.integers(2 ** 63))
+
+    def _generator(self) -> Callable[[int, int, int], procgen.Layout]:
+        """Return the function which generates a Layout for this pool."""
+        if self.cache:
+            return self.cache.generate_layout
+        return procgen.generate_layout
+
+    def fill(self) -> None:
+        """Submit jobs until `ahead` floors are built or being generated."""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.max_workers)
+        while len(self.ready) + len(self.pending) < self.ahead:
+            self.pending.append(
+                self.executor.submit(
+                    self._generator(), self.width, self.height, self._next_seed()
+                )
+            )
+
+    def next_layout(self) -> procgen.Layout:
+        """Return the next Layout which isn't built, waiting for it if needed.
+
+        If no floors are being generated then it's generated right away.
+        Call `fill` afterwards to keep generating ahead.
+        """
+        if not self.pending:
+            return self._generator()(self.width, self.height, self._next_seed())
+        return self.pending.popleft().result()
+
+    def build_ready(self) -> None:
+        """Build the GameMaps of the layouts which have finished generating."""
+        while self.pending and self.pending[0].done():
+            layout = self.pending.popleft().result()
+            self.ready.append(procgen.build(layout, self.player_ai))
+
+    def next_floor(self) -> gamemap.GameMap:
+        """Return the GameMap for the next floor."""
+        if self.ready:
+            return self.ready.popleft()
+        return procgen.build(self.next_layout(), self.player_ai)
+
+    def close(self) -> None:
+        """Cancel pending floors and stop the worker processes."""
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.ready.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
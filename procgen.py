@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import random
-from typing import Iterator, List, Tuple
+from typing import List, NamedTuple, Optional, Tuple, Type
 
 import numpy as np
-from tcod import libtcodpy
+import tcod.path
 
 import ai
 import fighter
@@ -26,6 +25,38 @@
     memory=(ord(" "), (255, 255, 255), (4, 9, 19)),
 )
 
+# Increment whenever generate_layout can give different results for the
+# same arguments, this invalidates cached layouts.
+GENERATOR_VERSION = 2
+
+# Layout tile indexes into TILESET.
+WALL_ID = 0
+FLOOR_ID = 1
+TILESET = np.asarray([WALL, FLOOR], dtype=gamemap.tile_dt)
+
+# Layout spawn kinds.
+SPAWN_PLAYER = 0
+SPAWN_GUARD = 1
+SPAWN_PISTOL = 2
+spawn_dt = np.dtype([("kind", np.uint8), ("x", np.int32), ("y", np.int32)])
+
+
+class GenerationStats(NamedTuple):
+    """Statistics reported by generate_layout."""
+
+    rooms: int  # Number of rooms placed.
+    regions: int  # Number of disconnected regions before repair.
+    cells_carved: int  # Number of wall cells opened to join regions.
+    walkable_cells: int  # Number of walkable cells, all reachable from spawn.
+
+
+class Layout(NamedTuple):
+    """A generated floor as compact arrays, cheap to pickle or save."""
+
+    tiles: np.ndarray  # uint8 indexes into TILESET.
+    spawns: np.ndarray  # spawn_dt records, in spawn order.
+    stats: Optional[GenerationStats] = None  # None for layouts loaded from disk.
+
 
 class Room:
     """Holds data and methods used to generate rooms."""
@@ -71,76 +102,214 @@ def distance_to(self, other: Room) -> float:
         return abs(other_x - x) + abs(other_y - y)
 
     def get_free_spaces(
-        self, gamemap: gamemap.GameMap, number: int
-    ) -> Iterator[Tuple[int, int]]:
-        """Iterate over the x,y coordinates of up to `number` spaces."""
-        for _ in range(number):
-            x = random.randint(self.x1 + 1, self.x2 - 2)
-            y = random.randint(self.y1 + 1, self.y2 - 2)
-            if gamemap.is_blocked(x, y):
-                continue
-            yield x, y
-
-    def place_entities(self, gamemap: gamemap.GameMap) -> None:
-        """Spawn entities within this room."""
-        monsters = random.randint(0, 1)
-        items = random.randint(0, 2)
-        for xy in self.get_free_spaces(gamemap, monsters):
-            fighter.Guard.spawn(gamemap[xy])
-
-        for xy in self.get_free_spaces(gamemap, items):
-            item.Pistol().place(gamemap[xy])
-
-
-def generate(width: int, height: int) -> gamemap.GameMap:
-    """Return a randomly generated GameMap."""
+        self, free: np.ndarray, number: int, rng: np.random.Generator
+    ) -> List[Tuple[int, int]]:
+        """Return the x,y coordinates of `number` distinct free inner spaces.
+
+        `free` is the map wide mask of free cells, the chosen cells are
+        removed from it.  Fewer spaces are returned only if the room has no
+        more free space.
+        """
+        chosen = gamemap.sample_cells(
+            rng, free[self.inner], number, (self.x1 + 1, self.y1 + 1)
+        )
+        for xy in chosen:
+            free[xy] = False
+        return chosen
+
+    def place_entities(
+        self, free: np.ndarray, rng: np.random.Generator
+    ) -> List[Tuple[int, int, int]]:
+        """Return the (kind, x, y) spawns for this room."""
+        monsters = int(rng.integers(0, 1, endpoint=True))
+        items = int(rng.integers(0, 2, endpoint=True))
+        spawns = [
+            (SPAWN_GUARD, x, y) for x, y in self.get_free_spaces(free, monsters, rng)
+        ]
+        # Items may share a cell with an earlier item but not with an actor.
+        item_free = free.copy()
+        spawns += [
+            (SPAWN_PISTOL, x, y)
+            for x, y in self.get_free_spaces(item_free, items, rng)
+        ]
+        return spawns
+
+
+def place_rooms(
+    rng: np.random.Generator,
+    width: int,
+    height: int,
+    max_rooms: int,
+    min_size: int,
+    max_size: int,
+    border: int,
+) -> np.ndarray:
+    """Return the (x1, y1, x2, y2) rectangles of non-intersecting rooms.
+
+    All candidates are drawn at once, then each candidate is kept only if it
+    does not intersect any earlier kept room, checked against an occupancy
+    mask.  Rooms are returned in placement order.
+    """
+    w = rng.integers(min_size, max_size, size=max_rooms, endpoint=True)
+    h = rng.integers(min_size, max_size, size=max_rooms, endpoint=True)
+    x = rng.integers(border, width - border - w, endpoint=True)
+    y = rng.integers(border, height - border - h, endpoint=True)
+    rects = np.stack([x, y, x + w, y + h], axis=1)
+
+    # Room edges are inclusive for intersection tests, see Room.intersects.
+    occupied = np.zeros((width + 1, height + 1), dtype=bool)
+    kept = np.zeros(max_rooms, dtype=bool)
+    for i, (x1, y1, x2, y2) in enumerate(rects.tolist()):
+        if occupied[x1 : x2 + 1, y1 : y2 + 1].any():
+            continue  # This room intersects with a previous room.
+        occupied[x1 : x2 + 1, y1 : y2 + 1] = True
+        kept[i] = True
+    return rects[kept]
+
+
+def nearest_previous(centers: np.ndarray, chunk_size: int = 256) -> np.ndarray:
+    """Return the index of the nearest preceding center for every center.
+
+    Distance is the Manhattan distance from Room.distance_to, ties go to
+    the earliest room.  The first index has no predecessor and gets 0.
+    """
+    count = len(centers)
+    nearest = np.zeros(count, dtype=np.intp)
+    for start in range(1, count, chunk_size):
+        stop = min(count, start + chunk_size)
+        dist = np.abs(centers[start:stop, np.newaxis] - centers[np.newaxis, :stop])
+        dist = dist.sum(axis=2)
+        later = np.arange(start, stop)[:, np.newaxis] <= np.arange(stop)
+        dist[later] = np.iinfo(dist.dtype).max
+        nearest[start:stop] = dist.argmin(axis=1)
+    return nearest
+
+
+def carve_tunnel(
+    tiles: np.ndarray, start: Tuple[int, int], end: Tuple[int, int], vertical: bool
+) -> None:
+    """Carve an L shaped tunnel of floor between two points of a layout."""
+    if vertical:
+        middle = start[0], end[1]
+    else:
+        middle = end[0], start[1]
+    for (x1, y1), (x2, y2) in ((start, middle), (middle, end)):
+        tiles[min(x1, x2) : max(x1, x2) + 1, min(y1, y2) : max(y1, y2) + 1] = FLOOR_ID
+
+
+def connect_regions(tiles: np.ndarray, origin: Tuple[int, int]) -> Tuple[int, int]:
+    """Carve corridors until every walkable cell can be reached from `origin`.
+
+    Each pass finds the unreachable walkable cell closest to the reachable
+    area and carves the shortest cardinal corridor to it.
+
+    Returns the number of regions which were found and the number of cells
+    carved.
+    """
+    unreached_value = np.iinfo(np.int32).max
+    regions = 1
+    cells_carved = 0
+    while True:
+        walkable = TILESET["move_cost"][tiles] != 0
+        distance = np.full(tiles.shape, unreached_value, dtype=np.int32)
+        distance[origin] = 0
+        tcod.path.dijkstra2d(
+            distance, walkable.astype(np.int8), cardinal=1, diagonal=1
+        )
+        reached = distance != unreached_value
+        unreached = walkable & ~reached
+        if not unreached.any():
+            return regions, cells_carved
+        regions += 1
+        # The distance of every cell from the reachable area, walls included.
+        distance[...] = unreached_value
+        distance[reached] = 0
+        tcod.path.dijkstra2d(
+            distance, np.ones(tiles.shape, dtype=np.int8), cardinal=1, diagonal=0
+        )
+        distance_from_reached = np.where(unreached, distance, unreached_value)
+        target_x, target_y = np.unravel_index(
+            distance_from_reached.argmin(), tiles.shape
+        )
+        path = tcod.path.hillclimb2d(
+            distance, (int(target_x), int(target_y)), cardinal=True, diagonal=False
+        )
+        corridor = tuple(path.T)
+        cells_carved += int(np.count_nonzero(tiles[corridor] != FLOOR_ID))
+        tiles[corridor] = FLOOR_ID
+
+
+def generate_layout(
+    width: int, height: int, seed: Optional[int] = None, max_rooms: int = 30
+) -> Layout:
+    """Return a randomly generated floor Layout."""
     room_max_size = 10
     room_min_size = 6
-    max_rooms = 30
     AREA_BORDER = 20
 
-    gm = gamemap.GameMap(width, height)
-    gm.tiles[...] = FLOOR
-    rooms: List[Room] = []
+    rng = np.random.default_rng(seed)
+    tiles = np.full((width, height), FLOOR_ID, dtype=np.uint8, order="F")
 
-    for i in range(max_rooms):
-        # random width and height
-        w = random.randint(room_min_size, room_max_size)
-        h = random.randint(room_min_size, room_max_size)
-        # random position without going out of the boundaries of the map
-        x = random.randint(AREA_BORDER, width - AREA_BORDER - w)
-        y = random.randint(AREA_BORDER, height - AREA_BORDER - h)
-        new_room = Room(x, y, w, h)
-        if any(new_room.intersects(other) for other in rooms):
-            continue  # This room intersects with a previous room.
+    rects = place_rooms(
+        rng, width, height, max_rooms, room_min_size, room_max_size, AREA_BORDER
+    )
+    centers = (rects[:, :2] + rects[:, 2:]) // 2
+    # 80% of tunnels are to the nearest room, 20% are to the previous room.
+    to_nearest = rng.integers(100, size=len(rects)) < 80
+    tunnel_to = np.where(
+        to_nearest, nearest_previous(centers), np.arange(len(rects)) - 1
+    )
+    vertical = rng.integers(2, size=len(rects)).astype(bool)
 
+    rooms: List[Room] = []
+    for i, (x1, y1, x2, y2) in enumerate(rects.tolist()):
+        new_room = Room(x1, y1, x2 - x1, y2 - y1)
         # Mark room inner area as open.
-        gm.tiles[new_room.outer] = WALL
-        gm.tiles[new_room.inner] = FLOOR
+        tiles[new_room.outer] = WALL_ID
+        tiles[new_room.inner] = FLOOR_ID
         if rooms:
             # Open a tunnel between rooms.
-            if random.randint(0, 99) < 80:
-                # 80% of tunnels are to the nearest room.
-                other_room = min(rooms, key=new_room.distance_to)
-            else:
-                # 20% of tunnels are to the previous generated room.
-                other_room = rooms[-1]
-            t_start = new_room.center
-            t_end = other_room.center
-            if random.randint(0, 1):
-                t_middle = t_start[0], t_end[1]
-            else:
-                t_middle = t_end[0], t_start[1]
-            gm.tiles[libtcodpy.line_where(*t_start, *t_middle)] = FLOOR
-            gm.tiles[libtcodpy.line_where(*t_middle, *t_end)] = FLOOR
+            other_room = rooms[tunnel_to[i]]
+            carve_tunnel(tiles, new_room.center, other_room.center, vertical[i])
         rooms.append(new_room)
 
-    # Add player to the first room.
-    gm.player = fighter.Player.spawn(gm[5, height - 5], ai_cls=ai.PlayerControl)
-    gm.actors.append(gm.player)
+    # Add player to the first room, then make sure the map is connected to it.
+    player_xy = 5, height - 5
+    tiles[player_xy] = FLOOR_ID
+    regions, cells_carved = connect_regions(tiles, player_xy)
+
+    free = TILESET["move_cost"][tiles] != 0
+    stats = GenerationStats(
+        len(rooms), regions, cells_carved, int(np.count_nonzero(free))
+    )
+    spawns = [(SPAWN_PLAYER, *player_xy)]
+    free[player_xy] = False
 
     for room in rooms:
-        room.place_entities(gm)
+        spawns += room.place_entities(free, rng)
 
+    return Layout(tiles, np.asarray(spawns, dtype=spawn_dt), stats)
+
+
+def build(
+    layout: Layout, player_ai: Type[ai.AI] = ai.PlayerControl
+) -> gamemap.GameMap:
+    """Return a new GameMap built from a Layout."""
+    gm = gamemap.GameMap(*layout.tiles.shape)
+    gm.tiles[...] = TILESET[layout.tiles]
+    for kind, x, y in layout.spawns.tolist():
+        if kind == SPAWN_PLAYER:
+            gm.player = fighter.Player.spawn(gm[x, y], ai_cls=player_ai)
+        elif kind == SPAWN_GUARD:
+            fighter.Guard.spawn(gm[x, y])
+        elif kind == SPAWN_PISTOL:
+            item.Pistol().place(gm[x, y])
     gm.update_fov()
     return gm
+
+
+def generate(
+    width: int, height: int, seed: Optional[int] = None, max_rooms: int = 30
+) -> gamemap.GameMap:
+    """Return a randomly generated GameMap."""
+    return build(generate_layout(width, height, seed, max_rooms))
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, Tuple
 
 import tcod.console
 
+from telemetry import profiler
+
 if TYPE_CHECKING:
     from tcod.console import Console
 
@@ -12,6 +14,46 @@
 
 UI_WIDTH = 30
 
+# Persistent off-screen consoles, keyed by their name and size.
+_console_pool: Dict[Tuple[str, int, int], Console] = {}
+# The inputs each pooled panel was last rendered with.
+_panel_keys: Dict[str, Hashable] = {}
+
+
+def get_console(name: str, width: int, height: int) -> Console:
+    """Return a persistent off-screen console for `name` of the given size.
+
+    Consoles are reused between frames and are only reallocated after
+    `clear_console_pool` is called, which happens on window resize.
+    """
+    key = name, width, height
+    console = _console_pool.get(key)
+    if console is None:
+        console = _console_pool[key] = tcod.console.Console(width, height, order="F")
+    return console
+
+
+def clear_console_pool() -> None:
+    """Drop all pooled consoles, they will be reallocated on the next frame."""
+    _console_pool.clear()
+    _panel_keys.clear()
+
+
+def draw_panel(
+    name: str, width: int, height: int, key: Hashable, draw: Callable[[Console], None]
+) -> Console:
+    """Return a pooled panel console, redrawing it only if `key` has changed.
+
+    `key` should hold the version stamps of everything `draw` depends on.
+    """
+    console = get_console(name, width, height)
+    full_key = width, height, key
+    if _panel_keys.get(name) != full_key:
+        console.clear()
+        draw(console)
+        _panel_keys[name] = full_key
+    return console
+
 
 def render_bar(
     console: tcod.console.Console,
@@ -31,46 +73,96 @@ def render_bar(
     bar_bg[:fill_width] = fg
 
 
-def draw_main_view(model: Model, console: Console) -> None:
-    bar_width = 20
-    player = model.player
-    if player.location:
-        model.active_map.camera_xy = player.location.xy
+def draw_inventory(console: Console, model: Model) -> None:
+    """Draw the players inventory list."""
+    for i, desc in enumerate(model.player.fighter.inventory.list_item_descriptions()):
+        console.print(1, i * 2, desc)
 
-    console_world = tcod.console.Console(
-        console.width - UI_WIDTH, console.height, order="F"
-    )
-    console_ui = tcod.console.Console(UI_WIDTH, console.height, order="F")
-    model.active_map.render(console_world)
 
+def draw_hp(console: Console, model: Model) -> None:
+    """Draw the players HP bar."""
+    fighter = model.player.fighter
     render_bar(
         console,
         1,
-        console.height - 2,
-        bar_width,
-        f"HP: {player.fighter.hp:02}/{player.fighter.max_hp:02}",
-        player.fighter.hp / player.fighter.max_hp,
+        1,
+        20,
+        f"HP: {fighter.hp:02}/{fighter.max_hp:02}",
+        fighter.hp / fighter.max_hp,
         (0x40, 0x80, 0),
         (0x80, 0, 0),
     )
 
-    y = 0
-    for desc in player.fighter.inventory.list_item_descriptions():
-        item_panel = tcod.console.Console(console_ui.width, 2)
-        item_panel.print(1, 0, desc)
-        item_panel.blit(console_ui, 0, y)
-        y += item_panel.height
-
-    log_top = y
-
-    x = 1
-    y = console_ui.height
-    log_width = console_ui.width - 1
-    for text in model.log[::-1]:
-        y -= tcod.console.get_height_rect(log_width, str(text))
-        if y < log_top:
+
+def draw_log(console: Console, model: Model) -> None:
+    """Draw as much of the message log as fits, newest messages at the bottom."""
+    y = console.height
+    for message in reversed(model.log):
+        lines = message.wrap(console.width - 1)
+        y -= len(lines)
+        if y < 0:
             break
-        console_ui.print_box(x, y, log_width, 0, str(text))
+        for i, line in enumerate(lines):
+            console.print(1, y + i, line)
+
+
+def draw_profiler(console: Console) -> None:
+    """Draw the latency percentiles of every profiled scope, in milliseconds."""
+    console.print(1, 0, "scope           p50  p95  p99", fg=(255, 255, 0))
+    for y, (name, stats) in enumerate(sorted(profiler.summary().items()), 1):
+        p50, p95, p99 = stats["p50"], stats["p95"], stats["p99"]
+        console.print(1, y, f"{name[:14]:14}{p50:5.1f}{p95:5.1f}{p99:5.1f}")
+
+
+@profiler.timed("draw_main_view")
+def draw_main_view(model: Model, console: Console) -> None:
+    player = model.player
+    if player.location:
+        model.active_map.camera_xy = player.location.xy
 
-    console.tiles[:-UI_WIDTH, :] = console_world.tiles
-    console.tiles[-UI_WIDTH:, :] = console_ui.tiles
+    console_world = get_console("world", console.width - UI_WIDTH, console.height)
+    console_world.clear()
+    model.active_map.render(console_world)
+    console_world.blit(console, 0, 0)
+
+    ui_x = console.width - UI_WIDTH
+    inventory = player.fighter.inventory
+    inventory_panel = draw_panel(
+        "inventory",
+        UI_WIDTH,
+        inventory.capacity * 2,
+        (inventory, inventory.version),
+        lambda panel: draw_inventory(panel, model),
+    )
+    inventory_panel.blit(console, ui_x, 0)
+
+    hp_panel = draw_panel(
+        "hp",
+        UI_WIDTH,
+        3,
+        (player.fighter, player.fighter.version),
+        lambda panel: draw_hp(panel, model),
+    )
+    hp_panel.blit(console, ui_x, console.height - hp_panel.height)
+
+    log_height = console.height - inventory_panel.height - hp_panel.height
+    if log_height > 0:
+        log_panel = draw_panel(
+            "log",
+            UI_WIDTH,
+            log_height,
+            (model, model.log_version),
+            lambda panel: draw_log(panel, model),
+        )
+        log_panel.blit(console, ui_x, inventory_panel.height)
+
+    if profiler.enabled and log_height > 0:
+        # Redrawn a few times a second so that it stays readable.
+        profiler_panel = draw_panel(
+            "profiler",
+            UI_WIDTH,
+            min(log_height, len(profiler.histograms) + 1),
+            profiler.refresh_key(),
+            draw_profiler,
+        )
+        profiler_panel.blit(console, ui_x, inventory_panel.height)
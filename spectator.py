@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import sys
+import threading
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+# Frame header: magic, frame id, width, height, number of runs, number of cells.
+HEADER = struct.Struct("<4sIHHII")
+MAGIC = b"7DRL"
+run_dt = np.dtype([("start", "<u4"), ("length", "<u4")])
+cell_dt = np.dtype([("ch", "<i4"), ("fg", "3B"), ("bg", "3B")])  # tiles_rgb
+
+Address = Union[str, Tuple[str, int]]
+
+
+def parse_address(text: str) -> Address:
+    """Parse "host:port" as a TCP address, anything else is a Unix socket path."""
+    host, sep, port = text.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return text
+
+
+def encode_delta(
+    frame_id: int, frame: np.ndarray, previous: Optional[np.ndarray]
+) -> bytes:
+    """Return the cells of `frame` which differ from `previous` as a packet.
+
+    Changed cells are run-length encoded as (start, length) runs over the
+    row-major cell index, followed by the raw cell data of every run.
+    `previous` of None, or of a different shape, encodes the whole frame.
+    """
+    width, height = frame.shape
+    cells = frame.ravel(order="F")
+    if previous is None or previous.shape != frame.shape:
+        changed = np.ones(cells.shape, dtype=bool)
+    else:
+        changed = cells != previous.ravel(order="F")
+    edges = np.flatnonzero(np.diff(changed, prepend=False, append=False))
+    runs = np.empty(edges.size // 2, dtype=run_dt)
+    runs["start"] = edges[::2]
+    runs["length"] = edges[1::2] - edges[::2]
+    # tiles_rgb is padded to 12 bytes a cell, the packet uses packed cells.
+    changed_cells = cells[changed].astype(cell_dt)
+    header = HEADER.pack(MAGIC, frame_id, width, height, runs.size, changed_cells.size)
+    return header + runs.tobytes() + changed_cells.tobytes()
+
+
+def apply_delta(frame: Optional[np.ndarray], packet: bytes) -> np.ndarray:
+    """Apply a packet from `encode_delta` to `frame` and return the result.
+
+    A new frame is allocated if `frame` is None or the frame size changed.
+    """
+    magic, _, width, height, n_runs, n_cells = HEADER.unpack_from(packet)
+    assert magic == MAGIC, magic
+    if frame is None or frame.shape != (width, height):
+        frame = np.zeros((width, height), dtype=cell_dt, order="F")
+    runs = np.frombuffer(packet, dtype=run_dt, count=n_runs, offset=HEADER.size)
+    changed_cells = np.frombuffer(
+        packet, dtype=cell_dt, count=n_cells, offset=HEADER.size + runs.nbytes
+    )
+    cells = frame.ravel(order="F")  # A view, since frame is Fortran ordered.
+    i = 0
+    for start, length in runs.tolist():
+        cells[start : start + length] = changed_cells[i : i + length]
+        i += length
+    return frame
+
+
+def read_packet(sock: socket.socket) -> Optional[bytes]:
+    """Read one whole packet from a spectator connection, or None on EOF."""
+    header = _read_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    _, _, _, _, n_runs, n_cells = HEADER.unpack(header)
+    body = _read_exactly(sock, n_runs * run_dt.itemsize + n_cells * cell_dt.itemsize)
+    if body is None:
+        return None
+    return header + body
+
+
+def _read_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+
+class SpectatorServer:
+    """Streams delta-encoded frames to any number of local clients.
+
+    `publish` only copies the frame.  Each client has its own thread which
+    encodes and sends the latest frame, so a slow client skips intermediate
+    frames instead of blocking the game.
+    """
+
+    def __init__(self, address: Address) -> None:
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.unlink(address)
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(address)
+        self.socket.listen()
+        self.address = address
+        self.closed = False
+        self.frame: Optional[np.ndarray] = None
+        self.frame_id = 0
+        self.condition = threading.Condition()  # Guards frame, closed and clients.
+        self.clients: List[socket.socket] = []
+        threading.Thread(target=self._accept_clients, daemon=True).start()
+
+    def publish(self, frame: np.ndarray) -> None:
+        """Make a copy of `frame` the latest frame sent to clients."""
+        frame = frame.copy(order="F")
+        with self.condition:
+            self.frame = frame
+            self.frame_id += 1
+            self.condition.notify_all()
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+            clients = list(self.clients)
+        self.socket.close()
+        for client in clients:
+            client.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def _accept_clients(self) -> None:
+        while not self.closed:
+            try:
+                client, _ = self.socket.accept()
+            except OSError:
+                return  # Server socket was closed.
+            with self.condition:
+                if self.closed:
+                    client.close()
+                    return
+                self.clients.append(client)
+            threading.Thread(
+                target=self._serve_client, args=(client,), daemon=True
+            ).start()
+
+    def _serve_client(self, client: socket.socket) -> None:
+        sent_id = 0
+        previous: Optional[np.ndarray] = None
+        try:
+            while True:
+                with self.condition:
+                    self.condition.wait_for(
+                        lambda: self.closed or self.frame_id != sent_id
+                    )
+                    if self.closed:
+                        return
+                    frame, sent_id = self.frame, self.frame_id
+                assert frame is not None
+                client.sendall(encode_delta(sent_id, frame, previous))
+                previous = frame
+        except OSError:
+            pass  # Client disconnected.
+        finally:
+            with self.condition:
+                self.clients.remove(client)
+            client.close()
+
+
+def main() -> None:
+    """Connect to a spectator server and draw its frames to this terminal."""
+    import headless
+
+    address = parse_address(sys.argv[1])
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.connect(address)
+        frame: Optional[np.ndarray] = None
+        while True:
+            packet = read_packet(sock)
+            if packet is None:
+                break
+            previous = None if frame is None else frame.copy()
+            frame = apply_delta(frame, packet)
+            sys.stdout.write(headless.to_ansi(frame, previous))
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
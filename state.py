@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import time
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional
+
 import tcod.console
 import tcod.event
 from tcod import libtcodpy
 
+import background
+import rendering
+from telemetry import frame_stats, profiler
+
 CONSOLE_MIN_SIZE = (60, 16)  # The smallest acceptable main console size.
+FRAME_INTERVAL = 1 / 60  # The shortest time between redraws, in seconds.
 g_console: tcod.console.Console  # Global console object.
+# Functions called with the console after each frame is drawn.
+g_frame_hooks: List[Callable[[tcod.console.Console], None]] = []
+
+_NOT_DRAWN = object()  # A frame key which never matches.
 
 
 class State(tcod.event.EventDispatch):
@@ -44,25 +56,64 @@ class State(tcod.event.EventDispatch):
         tcod.event.K_i: "inventory",
         tcod.event.K_g: "pickup",
         tcod.event.K_ESCAPE: "quit",
+        tcod.event.K_F3: "profiler",
     }
 
     def __init__(self) -> None:
         self.running = False
 
     def loop(self) -> None:
-        """Run a state based game loop."""
-        global g_console
+        """Run a state based game loop.
+
+        Queued events are dispatched as a batch, then the state is redrawn at
+        most once every `FRAME_INTERVAL` and only if `frame_key` has changed.
+        Background tasks run while waiting for events.
+        """
         self.running = True
+        drawn_key: Any = _NOT_DRAWN
+        next_frame = 0.0
         while self.running:
-            self.on_draw(g_console)
-            libtcodpy.console_flush(g_console)
-            for event in tcod.event.wait():
+            timeout: Optional[float] = None
+            key = self.frame_key(g_console)
+            if key is None or key != drawn_key:
+                now = time.perf_counter()
+                if now >= next_frame:
+                    self.draw_frame(g_console)
+                    drawn_key = key
+                    next_frame = now + FRAME_INTERVAL
+                else:
+                    timeout = next_frame - now  # Redraw once this expires.
+            if timeout is None and profiler.enabled:
+                timeout = profiler.REFRESH_INTERVAL  # Keep the overlay current.
+            for event in coalesce_events(background.wait(timeout)):
+                start = time.perf_counter()
                 if event.type == "WINDOWRESIZED":
-                    g_console = configure_console()
+                    resize_console()
                 self.dispatch(event)
+                frame_stats.record("dispatch", time.perf_counter() - start)
                 if not self.running:
                     break  # Events may set self.running to False.
 
+    def draw_frame(self, console: tcod.console.Console) -> None:
+        """Draw and present this state, recording how long each step took."""
+        start = time.perf_counter()
+        self.on_draw(console)
+        for hook in g_frame_hooks:
+            hook(console)
+        drawn = time.perf_counter()
+        with profiler.scope("console_flush"):
+            libtcodpy.console_flush(console)
+        frame_stats.record("draw", drawn - start)
+        frame_stats.record("flush", time.perf_counter() - drawn)
+        profiler.maybe_export()
+
+    def frame_key(self, console: tcod.console.Console) -> Optional[Hashable]:
+        """Return a value which changes whenever this state needs a redraw.
+
+        None means that the state is redrawn after every batch of events.
+        """
+        return None
+
     def on_draw(self, console: tcod.console.Console) -> None:
         raise NotImplementedError()
 
@@ -73,7 +124,17 @@ def ev_keydown(self, event: tcod.event.KeyDown) -> None:
         if event.sym in self.COMMAND_KEYS:
             getattr(self, f"cmd_{self.COMMAND_KEYS[event.sym]}")()
         elif event.sym in self.MOVE_KEYS:
-            self.cmd_move(*self.MOVE_KEYS[event.sym])
+            direction = self.MOVE_KEYS[event.sym]
+            if event.mod & tcod.event.KMOD_SHIFT and direction != (0, 0):
+                self.cmd_run(*direction)
+            else:
+                self.cmd_move(*direction)
+
+    def ev_mousebuttondown(self, event: tcod.event.MouseButtonDown) -> None:
+        if event.button == tcod.event.BUTTON_LEFT:
+            # tile is set by the root console in the pinned tcod 11.9, newer
+            # tcod typings only offer integer_position, which is in pixels.
+            self.cmd_click(*event.tile)  # type: ignore[attr-defined]
 
     def cmd_quit(self) -> None:
         """Save and quit."""
@@ -82,6 +143,16 @@ def cmd_quit(self) -> None:
     def cmd_move(self, x: int, y: int) -> None:
         pass
 
+    def cmd_run(self, x: int, y: int) -> None:
+        pass
+
+    def cmd_click(self, x: int, y: int) -> None:
+        """Handle a click on the console tile at x,y."""
+
+    def cmd_profiler(self) -> None:
+        """Toggle the subsystem profiler and its overlay."""
+        profiler.enabled = not profiler.enabled
+
     def cmd_pickup(self) -> None:
         pass
 
@@ -98,3 +169,25 @@ def configure_console() -> tcod.console.Console:
     width = max(width, CONSOLE_MIN_SIZE[0])
     height = max(height, CONSOLE_MIN_SIZE[1])
     return tcod.console.Console(width, height, order="F")
+
+
+def resize_console() -> None:
+    """Replace the main console after the window was resized."""
+    global g_console
+    g_console = configure_console()
+    rendering.clear_console_pool()
+
+
+def coalesce_events(events: Iterable[Any]) -> Iterator[Any]:
+    """Yield events, dropping all but the last of consecutive mouse motions."""
+    motion = None
+    for event in events:
+        if event.type == "MOUSEMOTION":
+            motion = event
+            continue
+        if motion is not None:
+            yield motion
+            motion = None
+        yield event
+    if motion is not None:
+        yield motion
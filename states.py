@@ -1,15 +1,24 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import time
+from typing import TYPE_CHECKING, Any, Hashable, Optional, Tuple
 
 import tcod
 import tcod.console
+import tcod.event
 
 import actions
+import ai
+import background
+import pathing
 import rendering
+import state as state_
+from action import Blocked
 from state import State
+from telemetry import profiler
 
 if TYPE_CHECKING:
+    from action import Action
     from item import Item
     from model import Model
 
@@ -22,20 +31,81 @@ def __init__(self, model: Model):
     def on_draw(self, console: tcod.console.Console) -> None:
         rendering.draw_main_view(self.model, console)
 
+    def frame_key(self, console: tcod.console.Console) -> Optional[Hashable]:
+        """Redraw only when the map, the log, or the console has changed."""
+        player = self.model.player
+        return (
+            console,
+            console.width,
+            console.height,
+            self.model.active_map.scheduler.last_unique_id,
+            self.model.log_version,
+            player.fighter.version,
+            player.inventory.version,
+            profiler.refresh_key(),
+        )
+
 
 class PlayerReady(GameMapState):
+    def __init__(self, model: Model):
+        super().__init__(model)
+        gamemap = model.active_map
+        background.start(
+            ("fov", gamemap), lambda: background.precompute_fovs(gamemap)
+        )
+        pool = model.floor_pool
+        if pool is not None:
+            background.start(
+                ("floors", pool), lambda: background.pregenerate_floors(pool)
+            )
+
+    def perform(self, action: Action) -> None:
+        """Perform an action and end this state, or report why it can't be."""
+        result = action.plan()
+        if isinstance(result, Blocked):
+            self.model.report(result.reason)
+            return
+        result.act()
+        self.running = False
+
     def cmd_quit(self) -> None:
         """Save and quit."""
         raise SystemExit()
 
     def cmd_move(self, x: int, y: int) -> None:
         """Move the player entity."""
-        actions.Move(self.model.player, (x, y)).poll().act()
-        self.running = False
+        self.perform(actions.Move(self.model.player, (x, y)))
+
+    def travel(self, travel: ai.Travel) -> None:
+        """Take the first step of `travel` now and the rest on later turns."""
+        self.perform(travel)
+        player_ai = self.model.player.ai
+        if not self.running and isinstance(player_ai, ai.PlayerControl):
+            player_ai.start_travel(travel)
+
+    def cmd_run(self, x: int, y: int) -> None:
+        """Move the player in a direction until something interrupts them."""
+        self.travel(ai.Travel(self.model.player, direction=(x, y)))
+
+    def cmd_travel(self, dest_xy: Tuple[int, int]) -> None:
+        """Travel to `dest_xy` through explored cells."""
+        map_ = self.model.active_map
+        walkable = map_.path_service.walkable(dest_xy)
+        walkable[~map_.explored] = 0
+        path = pathing.find_path(walkable, self.model.player.location.xy, dest_xy)
+        if not path:
+            self.model.report("You don't know a way there.")
+            return
+        self.travel(ai.Travel(self.model.player, path=path))
+
+    def cmd_click(self, x: int, y: int) -> None:
+        """Travel to the clicked map cell, if it has been explored."""
+        dest_xy = self.model.active_map.screen_to_world(x, y)
+        if dest_xy is not None and self.model.active_map.explored[dest_xy]:
+            self.cmd_travel(dest_xy)
 
     def cmd_pickup(self) -> None:
-        actions.Pickup(self.model.player).poll().act()
-        self.running = False
+        self.perform(actions.Pickup(self.model.player))
 
     def cmd_inventory(self) -> None:
         state = UseInventory(self.model)
@@ -48,6 +118,37 @@ def cmd_drop(self) -> None:
         self.running = not state.action_taken
 
 
+class Traveling(GameMapState):
+    """Redraws the map while the player travels, at a capped frame rate.
+
+    This doesn't run its own loop, `update` is called once per step.
+    """
+
+    FRAME_INTERVAL = 1 / 30  # The shortest time between redraws, in seconds.
+
+    def __init__(self, model: Model):
+        super().__init__(model)
+        self.next_frame = 0.0
+
+    def update(self) -> bool:
+        """Redraw if a frame is due, return False if any input stops travel.
+
+        Other events, such as quitting or resizing the window, are handled
+        as usual.
+        """
+        for event in state_.coalesce_events(tcod.event.get()):
+            if event.type in ("KEYDOWN", "MOUSEBUTTONDOWN"):
+                return False
+            if event.type == "WINDOWRESIZED":
+                state_.resize_console()
+            self.dispatch(event)
+        now = time.perf_counter()
+        if now >= self.next_frame:
+            self.draw_frame(state_.g_console)
+            self.next_frame = now + self.FRAME_INTERVAL
+        return True
+
+
 class GameOver(GameMapState):
     def cmd_quit(self) -> None:
         """Save and quit."""
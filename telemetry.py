@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import collections
+import functools
+import json
+import threading
+import time
+from typing import IO, Any, Callable, Deque, Dict, Optional, TypeVar
+
+import numpy as np
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Histogram:
+    """A rolling window of timing samples, measured in seconds."""
+
+    def __init__(self, size: int = 1024) -> None:
+        self.samples: Deque[float] = collections.deque(maxlen=size)
+        self.count = 0  # Total number of samples ever recorded.
+        self.total = 0.0  # Total time of all samples ever recorded.
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, percent: float) -> float:
+        """Return the given percentile of the rolling window, in seconds."""
+        if not self.samples:
+            return 0.0
+        return float(np.percentile(self.samples, percent))
+
+    def summary(self) -> Dict[str, float]:
+        """Return the statistics of this histogram in milliseconds."""
+        window = np.asarray(self.samples) * 1000
+        return {
+            "count": self.count,
+            "mean": self.total * 1000 / self.count if self.count else 0.0,
+            "p50": float(np.percentile(window, 50)) if window.size else 0.0,
+            "p95": float(np.percentile(window, 95)) if window.size else 0.0,
+            "p99": float(np.percentile(window, 99)) if window.size else 0.0,
+            "max": float(window.max()) if window.size else 0.0,
+        }
+
+
+class FrameStats:
+    """Named histograms for the phases of each frame.
+
+    Samples may be recorded from worker threads, such as the path service.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, Histogram] = collections.defaultdict(Histogram)
+        self.lock = threading.Lock()  # Guards histograms and their samples.
+
+    def record(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.histograms[name].add(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            return {name: hist.summary() for name, hist in self.histograms.items()}
+
+    def dump(self, file: IO[str]) -> None:
+        """Write the summary of all histograms to `file` as JSON."""
+        json.dump(self.summary(), file, indent=2)
+        file.write("\n")
+
+
+class StartupTimer:
+    """Records when each phase of startup finished."""
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        self.start = time.perf_counter() if start is None else start
+        self.phases: Dict[str, float] = {}  # Seconds from start to each phase.
+
+    def mark(self, phase: str) -> None:
+        """Record that `phase` has just finished."""
+        self.phases[phase] = time.perf_counter() - self.start
+
+    def dump(self, file: IO[str]) -> None:
+        """Write the phase times to `file` as JSON, in milliseconds."""
+        json.dump({name: t * 1000 for name, t in self.phases.items()}, file, indent=2)
+        file.write("\n")
+
+
+class Scope:
+    """A context manager which times its block into a Profiler."""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        if self.profiler.enabled:
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.profiler.enabled and self.start:
+            self.profiler.record(self.name, time.perf_counter() - self.start)
+        self.start = 0.0
+
+
+class Profiler(FrameStats):
+    """Named timing scopes for the engine's subsystems.
+
+    While disabled a scope only costs a check of `enabled`.  If
+    `export_file` is set then `maybe_export` writes the summary to it as a
+    JSON line every `export_interval` seconds.
+    """
+
+    REFRESH_INTERVAL = 0.25  # Seconds between redraws of the overlay.
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.enabled = False
+        self.export_file: Optional[IO[str]] = None
+        self.export_interval = 5.0  # Seconds between exported lines.
+        self.next_export = 0.0
+
+    def refresh_key(self) -> Optional[int]:
+        """Return a value which changes whenever the overlay should be redrawn.
+
+        This is None while the profiler is disabled.
+        """
+        if not self.enabled:
+            return None
+        return int(time.perf_counter() / self.REFRESH_INTERVAL)
+
+    def close_export(self) -> None:
+        """Close `export_file`, if there is one."""
+        if self.export_file is not None:
+            self.export_file.close()
+            self.export_file = None
+
+    def scope(self, name: str) -> Scope:
+        """Return a context manager which times its block as `name`."""
+        return Scope(self, name)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Return a decorator which times every call of a function as `name`."""
+
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+
+            return wrapper  # type: ignore
+
+        return decorator
+
+    def maybe_export(self) -> None:
+        """Write a JSON line to `export_file` if `export_interval` has passed."""
+        if not self.enabled or self.export_file is None:
+            return
+        now = time.perf_counter()
+        if now < self.next_export:
+            return
+        self.next_export = now + self.export_interval
+        line = {"time": time.time(), "scopes": self.summary()}
+        self.export_file.write(json.dumps(line) + "\n")
+        self.export_file.flush()
+
+
+frame_stats = FrameStats()  # Timings for State.loop: draw, flush and dispatch.
+# Subsystem timings, toggled with F3 or enabled by --profile-scopes.
+profiler = Profiler()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import pytest
+
+import batch
+from benchmarks.common import make_model, spawn_guards
+from model import Model
+
+TICKS = 3000
+
+
+def run(batched: bool, seed: int, player_hp: Optional[int] = None) -> Model:
+    """Return a crowded model after running it for TICKS game ticks.
+
+    If `player_hp` is given then the run also stops once the player dies.
+    """
+    model = make_model(60, 60, seed)
+    spawn_guards(model, 300, seed)
+    model.active_map.ai_lod_radius = None
+    if player_hp is not None:
+        model.player.fighter.hp = player_hp
+    scheduler = model.active_map.scheduler
+    while scheduler.heap[0].tick < TICKS and not model.is_player_dead():
+        if batched:
+            batch.invoke_batch(model.active_map)
+        else:
+            scheduler.invoke_next()
+    return model
+
+
+def snapshot(model: Model) -> Dict[str, Any]:
+    store = model.active_map.actor_store
+    scheduler = model.active_map.scheduler
+    return {
+        "log": [str(message) for message in model.log],
+        "handles": list(store.slot_handles),
+        "queue": sorted((ticket.tick, ticket.unique_id) for ticket in scheduler.heap),
+        **{
+            name: getattr(store, name)[: store.count].tolist() for name in store.COLUMNS
+        },
+    }
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_batch_matches_sequential(seed: int) -> None:
+    assert snapshot(run(True, seed)) == snapshot(run(False, seed))
+
+
+def test_batch_stops_when_the_player_dies() -> None:
+    batched, sequential = run(True, 0, player_hp=10), run(False, 0, player_hp=10)
+    assert batched.is_player_dead()
+    assert not batched.active_map.scheduler.detached
+    assert snapshot(batched) == snapshot(sequential)
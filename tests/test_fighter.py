@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from benchmarks.common import make_model, spawn_guards
+
+
+def test_stats_are_views_of_the_store() -> None:
+    model = make_model(60, 60)
+    spawn_guards(model, 20)
+    map_ = model.active_map
+    store = map_.actor_store
+    guards = [actor for actor in map_.actors if actor is not map_.player]
+
+    store.hp[: store.count] -= 3  # A vectorized update.
+    assert all(guard.fighter.hp == 10 - 3 for guard in guards)
+
+    fighter = guards[0].fighter
+    version = fighter.version
+    fighter.power = 7
+    fighter.hp -= 1
+    assert store.power[guards[0].slot] == 7
+    assert store.hp[guards[0].slot] == 10 - 4
+    assert fighter.version == version + 1
+
+    guards[0].despawn()  # Moves the last actor into its slot.
+    assert (fighter.hp, fighter.power, fighter.max_hp) == (10 - 4, 7, 10)
+    assert all(guard.fighter.hp == 10 - 3 for guard in guards[1:])
@@ -0,0 +1,38 @@
+"""Golden-frame test of the headless renderer.
+
+Run this file directly to regenerate the golden frame after an intended
+change to the map, the UI or the game rules.
+"""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from benchmarks.common import make_model, run_turns
+from headless import HeadlessRenderer
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "golden", "headless.npz")
+TURNS = 200
+
+
+def render_frame() -> np.ndarray:
+    """Return the frame of a fixed-seed model after TURNS turns."""
+    model = make_model(80, 60, seed=3)
+    run_turns(model, TURNS)
+    return HeadlessRenderer(80, 50).render(model)
+
+
+def test_golden_frame() -> None:
+    frame = render_frame()
+    assert frame.shape == (80, 50)
+    assert (frame["ch"] == ord("@")).sum() == 1  # The player is in view.
+    with np.load(GOLDEN_PATH) as golden:
+        for name in ("ch", "fg", "bg"):
+            np.testing.assert_array_equal(frame[name], golden[name], err_msg=name)
+
+
+if __name__ == "__main__":
+    frame = render_frame()
+    os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+    np.savez_compressed(GOLDEN_PATH, ch=frame["ch"], fg=frame["fg"], bg=frame["bg"])
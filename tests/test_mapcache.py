@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import numpy as np
+
+import mapcache
+import procgen
+
+
+def assert_same_layout(layout: procgen.Layout, expected: procgen.Layout) -> None:
+    np.testing.assert_array_equal(layout.tiles, expected.tiles)
+    np.testing.assert_array_equal(layout.spawns, expected.spawns)
+
+
+def test_round_trip(tmp_path: Any) -> None:
+    cache = mapcache.MapCache(str(tmp_path))
+    assert cache.get(60, 60, 1, max_rooms=30) is None
+    layout = procgen.generate_layout(60, 60, 1)
+    cache.put(layout, 60, 60, 1, max_rooms=30)
+    cached = cache.get(60, 60, 1, max_rooms=30)
+    assert cached is not None
+    assert_same_layout(cached, layout)
+    assert cached.tiles.flags.f_contiguous
+    assert cache.get(60, 60, 2, max_rooms=30) is None
+    assert cache.get(60, 60, 1, max_rooms=10) is None
+
+
+def test_generate_layout_uses_cache(tmp_path: Any) -> None:
+    cache = mapcache.MapCache(str(tmp_path))
+    layout = cache.generate_layout(60, 60, 3)
+    assert layout.stats is not None  # Generated.
+    cached = cache.generate_layout(60, 60, 3)
+    assert cached.stats is None  # Loaded from disk.
+    assert_same_layout(cached, layout)
+
+
+def test_generator_version_invalidates(tmp_path: Any, monkeypatch: Any) -> None:
+    cache = mapcache.MapCache(str(tmp_path))
+    cache.put(procgen.generate_layout(60, 60, 1), 60, 60, 1)
+    monkeypatch.setattr(procgen, "GENERATOR_VERSION", procgen.GENERATOR_VERSION + 1)
+    assert cache.get(60, 60, 1) is None
+
+
+def test_truncated_entry_is_a_miss(tmp_path: Any) -> None:
+    cache = mapcache.MapCache(str(tmp_path))
+    cache.put(procgen.generate_layout(60, 60, 1), 60, 60, 1)
+    path = cache.path_for(60, 60, 1)
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) // 2)
+    assert cache.get(60, 60, 1) is None
+
+
+def test_evicts_least_recently_used(tmp_path: Any) -> None:
+    cache = mapcache.MapCache(str(tmp_path))
+    sizes = []
+    for seed in range(3):
+        cache.put(procgen.generate_layout(60, 60, seed), 60, 60, seed)
+        path = cache.path_for(60, 60, seed)
+        os.utime(path, (seed, seed))  # Oldest first.
+        sizes.append(os.path.getsize(path))
+    cache.max_bytes = sizes[1] + sizes[2]
+    cache.evict()
+    assert cache.get(60, 60, 0) is None
+    assert cache.get(60, 60, 1) is not None
+    assert cache.get(60, 60, 2) is not None
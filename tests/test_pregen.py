@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+from typing import List
+
+import numpy as np
+
+import background
+import pregen
+import procgen
+
+
+def floor_seeds(seed: int, count: int) -> List[int]:
+    """Return the seeds of the first `count` floors of a pool seeded `seed`."""
+    rng = np.random.default_rng(seed)
+    return [int(rng.integers(2 ** 63)) for _ in range(count)]
+
+
+def assert_same_layout(layout: procgen.Layout, expected: procgen.Layout) -> None:
+    np.testing.assert_array_equal(layout.tiles, expected.tiles)
+    np.testing.assert_array_equal(layout.spawns, expected.spawns)
+
+
+def test_pooled_floors_match_generate_layout() -> None:
+    pool = pregen.FloorPool(60, 60, ahead=2, seed=7)
+    try:
+        first = pool.next_layout()  # Nothing pending, generated in process.
+        pool.fill()
+        pooled = [pool.next_layout(), pool.next_layout()]
+    finally:
+        pool.close()
+    for layout, seed in zip([first, *pooled], floor_seeds(7, 3)):
+        assert_same_layout(layout, procgen.generate_layout(60, 60, seed))
+
+
+def test_pregenerated_floors_are_built_in_order() -> None:
+    pool = pregen.FloorPool(60, 60, ahead=2, seed=7)
+    try:
+        asyncio.run(background.pregenerate_floors(pool))
+        assert not pool.pending
+        built = [pool.ready[0], pool.ready[1]]
+        assert [pool.next_floor(), pool.next_floor()] == built
+    finally:
+        pool.close()
+    for gm, seed in zip(built, floor_seeds(7, 2)):
+        expected = procgen.generate_layout(60, 60, seed)
+        np.testing.assert_array_equal(gm.tiles, procgen.TILESET[expected.tiles])
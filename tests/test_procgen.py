@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+import pytest
+
+import procgen
+
+
+def reachable(walkable: np.ndarray, origin: Tuple[int, int]) -> np.ndarray:
+    """Return the cells reachable from `origin` by 8-way steps, by flood fill."""
+    reached = np.zeros_like(walkable)
+    reached[origin] = True
+    while True:
+        grown = reached.copy()
+        grown[1:, :] |= reached[:-1, :]
+        grown[:-1, :] |= reached[1:, :]
+        grown[:, 1:] |= grown[:, :-1].copy()
+        grown[:, :-1] |= grown[:, 1:].copy()
+        grown &= walkable
+        if (grown == reached).all():
+            return reached
+        reached = grown
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("size, max_rooms", [((80, 60), 30), ((120, 80), 10)])
+def test_layout_invariants(seed: int, size: Tuple[int, int], max_rooms: int) -> None:
+    layout = procgen.generate_layout(*size, seed, max_rooms)
+    stats = layout.stats
+    assert stats is not None
+    assert layout.tiles.shape == size
+    assert 1 <= stats.rooms <= max_rooms
+
+    walkable = procgen.TILESET["move_cost"][layout.tiles] != 0
+    assert stats.walkable_cells == np.count_nonzero(walkable)
+    player = layout.spawns[0]
+    assert player["kind"] == procgen.SPAWN_PLAYER
+    origin = int(player["x"]), int(player["y"])
+    assert (reachable(walkable, origin) == walkable).all()
+
+    xy = layout.spawns[["x", "y"]].tolist()
+    assert len(set(xy)) == len(xy)  # No two spawns share a cell.
+    assert walkable[layout.spawns["x"], layout.spawns["y"]].all()
+
+
+def test_layout_is_deterministic() -> None:
+    first = procgen.generate_layout(80, 60, seed=1)
+    second = procgen.generate_layout(80, 60, seed=1)
+    np.testing.assert_array_equal(first.tiles, second.tiles)
+    np.testing.assert_array_equal(first.spawns, second.spawns)
+    assert first.stats == second.stats
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import socket
+from typing import Any
+
+import numpy as np
+import tcod.console
+
+import spectator
+
+
+def make_frame(seed: int) -> np.ndarray:
+    console = tcod.console.Console(20, 10, order="F")
+    rng = np.random.default_rng(seed)
+    console.ch[...] = rng.integers(0x20, 0x7F, console.ch.shape)
+    console.fg[...] = rng.integers(0, 256, console.fg.shape)
+    console.bg[...] = rng.integers(0, 256, console.bg.shape)
+    frame: np.ndarray = console.tiles_rgb.copy()
+    return frame
+
+
+def test_delta_round_trip() -> None:
+    first = make_frame(0)
+    second = first.copy()
+    second[3:7, 2] = make_frame(1)[3:7, 2]
+    second[19, 9] = make_frame(2)[19, 9]
+
+    frame = spectator.apply_delta(None, spectator.encode_delta(1, first, None))
+    np.testing.assert_array_equal(frame["ch"], first["ch"])
+    np.testing.assert_array_equal(frame["fg"], first["fg"])
+    np.testing.assert_array_equal(frame["bg"], first["bg"])
+
+    packet = spectator.encode_delta(2, second, first)
+    frame = spectator.apply_delta(frame, packet)
+    np.testing.assert_array_equal(frame["ch"], second["ch"])
+    np.testing.assert_array_equal(frame["fg"], second["fg"])
+    np.testing.assert_array_equal(frame["bg"], second["bg"])
+
+
+def test_server_streams_and_closes(tmp_path: Any) -> None:
+    server = spectator.SpectatorServer(str(tmp_path / "spectator.sock"))
+    clients = []
+    try:
+        for _ in range(3):
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            client.connect(server.address)
+            clients.append(client)
+        server.publish(make_frame(0))
+        for client in clients:
+            packet = spectator.read_packet(client)
+            assert packet is not None
+            frame = spectator.apply_delta(None, packet)
+            np.testing.assert_array_equal(frame["ch"], make_frame(0)["ch"])
+    finally:
+        server.close()
+    for client in clients:
+        assert spectator.read_packet(client) is None  # Closed by the server.
+        client.close()
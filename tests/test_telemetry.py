@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import threading
+
+from telemetry import FrameStats
+
+
+def test_record_from_threads() -> None:
+    stats = FrameStats()
+    names = [f"scope{i}" for i in range(8)]
+
+    def record() -> None:
+        for i in range(2000):
+            stats.record(names[i % len(names)], 0.001)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        stats.summary()  # Must not race with the new histograms.
+    for thread in threads:
+        thread.join()
+    summary = stats.summary()
+    assert sorted(summary) == names
+    assert sum(scope["count"] for scope in summary.values()) == 4 * 2000
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import heapq
-from typing import Callable, List, NamedTuple, Optional
+from typing import Callable, List, NamedTuple, Optional, Set
+
+from telemetry import profiler
 
 
 class Ticket(NamedTuple):
@@ -19,6 +21,8 @@ def __init__(self) -> None:
         self.current_tick = 0
         self.last_unique_id = 0  # Used to sort same-tick ticks in FIFO order.
         self.heap: List[Ticket] = []
+        # Unique ids of tickets popped by pop_due which are still active.
+        self.detached: Set[int] = set()
 
     def schedule(
         self, interval: int, func: Callable[[TurnQueue, Ticket], None]
@@ -54,15 +58,19 @@ def reschedule(
         Returns the newly scheduled Ticket instance.
         """
         assert ticket is not None
-        assert self.heap[0] is ticket
-        ticket = Ticket(
+        new_ticket = Ticket(
             self.current_tick + interval,
             self.last_unique_id,
             ticket.func if func is None else func,
         )
-        heapq.heappushpop(self.heap, ticket)
+        if ticket.unique_id in self.detached:
+            self.detached.remove(ticket.unique_id)
+            heapq.heappush(self.heap, new_ticket)
+        else:
+            assert self.heap[0] is ticket
+            heapq.heappushpop(self.heap, new_ticket)
         self.last_unique_id += 1
-        return ticket
+        return new_ticket
 
     def unschedule(self, ticket: Ticket) -> None:
         """Explicitly remove the current ticket.
@@ -70,14 +78,45 @@ def unschedule(self, ticket: Ticket) -> None:
         `ticket` must be the currently active Ticket.
         """
         assert ticket is not None
+        if ticket.unique_id in self.detached:
+            self.detached.remove(ticket.unique_id)
+            return
         assert self.heap[0] is ticket
         heapq.heappop(self.heap)
 
+    def pop_due(self, accept: Callable[[Ticket], bool]) -> List[Ticket]:
+        """Pop tickets due at the next tick, in order, while `accept` allows.
+
+        Popped tickets stay active: they must still be rescheduled or
+        unscheduled by whoever runs them, in any order.
+        """
+        tickets: List[Ticket] = []
+        if not self.heap:
+            return tickets
+        tick = self.heap[0].tick
+        while self.heap and self.heap[0].tick == tick and accept(self.heap[0]):
+            ticket = heapq.heappop(self.heap)
+            self.detached.add(ticket.unique_id)
+            tickets.append(ticket)
+        if tickets:
+            self.current_tick = tick
+        return tickets
+
+    def reattach(self, tickets: List[Ticket]) -> None:
+        """Put tickets popped by pop_due back onto the queue unchanged."""
+        for ticket in tickets:
+            self.detached.remove(ticket.unique_id)
+            heapq.heappush(self.heap, ticket)
+
+    @profiler.timed("invoke_next")
     def invoke_next(self) -> None:
         """Call the next scheduled function.
 
         This expects the scheduled function to take care of removing or
         rescheduling its own Ticket object.  It will fail otherwise.
+
+        The player's turn includes waiting for their input, so the profile of
+        this is only meaningful for the turns of other actors.
         """
         ticket = self.heap[0]
         self.current_tick = ticket.tick